@@ -0,0 +1,102 @@
+import os
+import json
+import pygame
+
+# Asset cache: every image is loaded, scaled and converted once per
+# (name, size, alpha mode) and the same surface is handed out afterwards.
+# Sprites only ever blit their image, so sharing one surface is safe.
+class AssetCache:
+    def __init__(self, asset_dir='assets'):
+        self.asset_dir = asset_dir
+        self.surfaces = {}
+        self.masks = {}
+        self.atlas = None
+        self.atlas_frames = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load_atlas(self, metadata_name='atlas.json'):
+        # One decode for every sprite; frames are cut out as subsurfaces on demand
+        path = os.path.join(self.asset_dir, metadata_name)
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'r') as f:
+                metadata = json.load(f)
+            image = pygame.image.load(os.path.join(self.asset_dir, metadata["image"]))
+        except (OSError, ValueError, KeyError, pygame.error):
+            return False
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        self.atlas = image
+        self.atlas_frames = {name: pygame.Rect(rect) for name, rect in metadata["frames"].items()}
+        return True
+
+    def load_image(self, name, fallback_color=(255, 255, 255), size=(50, 40), alpha='auto'):
+        # 'auto' keeps per-pixel alpha for PNGs and drops it for everything else
+        if alpha == 'auto':
+            alpha = name.lower().endswith('.png')
+        key = (name, tuple(size), bool(alpha))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self._load(name, fallback_color, size, alpha)
+        self.surfaces[key] = surface
+        return surface
+
+    def load_mask(self, name, fallback_color=(255, 255, 255), size=(50, 40), alpha='auto'):
+        # Collision mask of the same image, built once and shared like the surface.
+        # Opaque images (and fallback rectangles) get a full mask.
+        if alpha == 'auto':
+            alpha = name.lower().endswith('.png')
+        key = (name, tuple(size), bool(alpha))
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.load_image(name, fallback_color, size, alpha))
+            self.masks[key] = mask
+        return mask
+
+    def _load(self, name, fallback_color, size, alpha):
+        # Atlas frames are already at their in-game size, so no scaling is needed
+        frame = self.atlas_frames.get(name)
+        if alpha and frame is not None and frame.size == tuple(size):
+            return self.atlas.subsurface(frame)
+
+        path = os.path.join(self.asset_dir, name)
+        if os.path.exists(path):
+            image = pygame.image.load(path)
+            if image.get_size() != tuple(size):
+                image = pygame.transform.scale(image, size)
+        else:
+            # If image not found, use a colored rectangle fallback
+            image = pygame.Surface(size)
+            image.fill(fallback_color)
+            alpha = False
+
+        # convert() needs a display mode; tools without a window keep the raw surface
+        if pygame.display.get_surface() is None:
+            return image
+        return image.convert_alpha() if alpha else image.convert()
+
+    def preload(self, images):
+        # images: iterable of (name, fallback_color, size) tuples
+        for name, fallback_color, size in images:
+            self.load_image(name, fallback_color, size)
+
+    def clear(self):
+        self.surfaces.clear()
+        self.masks.clear()
+        self.atlas = None
+        self.atlas_frames = {}
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached": len(self.surfaces),
+            "masks": len(self.masks),
+            "atlas_frames": len(self.atlas_frames)
+        }
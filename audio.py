@@ -0,0 +1,107 @@
+from pygame import mixer
+
+# Sound effect player with a fixed budget of mixer channels.
+# Each category ('player', 'enemy', ...) gets its own reserved channels, so
+# a storm of enemy shots can never take the channel a power-up needs. On top
+# of that every sound has a cap on how many copies may play at once, and a
+# sound started more than once in the same frame only plays once.
+# A sound can have several variants (e.g. pitch-shifted copies); plays
+# rotate through them. Everything that does not play is counted by reason.
+# set_voice_limit() lowers every sound's cap at once, e.g. on low quality.
+# With no mixer (no audio device) play() only counts.
+class AudioManager:
+    def __init__(self, categories, volume=1.0):
+        # categories: name -> number of reserved channels
+        self.enabled = mixer.get_init() is not None
+        self.volume = volume
+        self.voice_limit = None
+        self.sounds = {}
+        self.channels = {}
+        self.frame_played = set()
+        self.played = 0
+        self.dropped = {"same_frame": 0, "voice_cap": 0, "no_channel": 0}
+        self.per_sound = {}
+        total = sum(categories.values())
+        if self.enabled:
+            mixer.set_num_channels(total)
+            # Reserved channels are never picked by Sound.play(), only by us
+            mixer.set_reserved(total)
+        first = 0
+        for category, count in categories.items():
+            if self.enabled:
+                self.channels[category] = [mixer.Channel(i) for i in range(first, first + count)]
+            else:
+                self.channels[category] = []
+            first += count
+
+    def load(self, name, path, category, max_voices=2, volume=1.0):
+        # Raises like mixer.Sound() when the file cannot be loaded
+        sound = mixer.Sound(path) if self.enabled else None
+        self.add(name, sound, category, max_voices, volume)
+
+    def add(self, name, sound, category, max_voices=2, volume=1.0):
+        # sound: a mixer.Sound, a list of variants, or None to only count plays
+        if category not in self.channels:
+            raise KeyError(f"Unknown sound category {category!r}")
+        variants = list(sound) if isinstance(sound, (list, tuple)) else [sound] if sound is not None else []
+        self.sounds[name] = (variants, category, max_voices, volume)
+        self.per_sound.setdefault(name, {"played": 0, "dropped": 0})
+        for variant in variants:
+            variant.set_volume(self.volume * volume)
+
+    def set_volume(self, volume):
+        self.volume = volume
+        for variants, _, _, own_volume in self.sounds.values():
+            for variant in variants:
+                variant.set_volume(volume * own_volume)
+
+    def set_voice_limit(self, limit):
+        # Caps every sound at min(its own max_voices, limit); None lifts the cap
+        self.voice_limit = limit
+
+    def begin_frame(self):
+        self.frame_played.clear()
+
+    def play(self, name):
+        entry = self.sounds.get(name)
+        if entry is None:
+            return False
+        variants, category, max_voices, _ = entry
+        if name in self.frame_played:
+            return self._drop(name, "same_frame")
+        self.frame_played.add(name)
+        if not self.enabled or not variants:
+            return self._drop(name, "no_channel")
+
+        free = None
+        voices = 0
+        for channel in self.channels[category]:
+            if channel.get_busy():
+                if channel.get_sound() in variants:
+                    voices += 1
+            elif free is None:
+                free = channel
+        if self.voice_limit is not None:
+            max_voices = min(max_voices, self.voice_limit)
+        if voices >= max_voices:
+            return self._drop(name, "voice_cap")
+        if free is None:
+            return self._drop(name, "no_channel")
+        counts = self.per_sound[name]
+        free.play(variants[counts["played"] % len(variants)])
+        self.played += 1
+        counts["played"] += 1
+        return True
+
+    def _drop(self, name, reason):
+        self.dropped[reason] += 1
+        self.per_sound[name]["dropped"] += 1
+        return False
+
+    def stats(self):
+        return {
+            "played": self.played,
+            "dropped": dict(self.dropped),
+            "dropped_total": sum(self.dropped.values()),
+            "sounds": {name: dict(counts) for name, counts in self.per_sound.items()}
+        }
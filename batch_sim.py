@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Runs many seeded headless games with the bot player across all CPU cores,
+# for balance tuning and stress testing. Each worker process builds one
+# headless Game (stats kept in memory) and then plays whole games back to
+# back; only the small per-game result dict travels back to this process.
+# Results are streamed as games finish and summarized at the end.
+# Usage: python batch_sim.py --games 1000 [--workers N] [--set POWERUP_DROP_CHANCE=0.3]
+METRICS = ("score", "level", "kills", "survival_time", "frame_ms")
+
+game = None
+
+def init_worker(overrides):
+    global game
+    import main
+    for name, value in overrides.items():
+        if not hasattr(main, name):
+            raise AttributeError(f"main.py has no constant {name}")
+        setattr(main, name, value)
+    game = main.Game(main.parse_args(["--headless"]))
+
+def play(seed, max_frames):
+    return game.simulate_game(seed, max_frames)
+
+def parse_override(text):
+    # NAME=VALUE, VALUE as a JSON literal: 0.3, [1000, 2000], ...
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    try:
+        value = json.loads(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a JSON value")
+    # Lists become tuples so randint(*delay) style constants keep working
+    return name.strip(), tuple(value) if isinstance(value, list) else value
+
+def summarize(results):
+    summary = {}
+    for metric in METRICS:
+        values = sorted(r[metric] for r in results)
+        n = len(values)
+        summary[metric] = {
+            "mean": statistics.fmean(values),
+            "stdev": statistics.stdev(values) if n > 1 else 0.0,
+            "min": values[0],
+            "p50": values[n // 2],
+            "p95": values[min(n - 1, n * 95 // 100)],
+            "max": values[-1],
+        }
+    return summary
+
+def run_batch(games, workers, first_seed=0, max_frames=0, overrides=None, on_result=None):
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(overrides or {},)) as pool:
+        futures = [pool.submit(play, first_seed + i, max_frames) for i in range(games)]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result, len(results))
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Space Shooter batch simulation")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--max-frames", type=int, default=36000, help="end games still running after this many frames (0 = no limit)")
+    parser.add_argument("--set", dest="overrides", action="append", type=parse_override, default=[],
+                        metavar="NAME=VALUE", help="override a balance constant from main.py")
+    parser.add_argument("--json", help="write every result and the summary to this file")
+    parser.add_argument("--quiet", action="store_true", help="no per-game lines")
+    options = parser.parse_args()
+    overrides = dict(options.overrides)
+
+    def report(result, done):
+        if not options.quiet:
+            print(f"[{done:>5}/{options.games}] seed {result['seed']:>6}: score {result['score']:>6} "
+                  f"level {result['level']:>3} kills {result['kills']:>4} "
+                  f"survived {result['survival_time']:>7.1f}s  {result['frame_ms']:.3f} ms/frame", flush=True)
+
+    start = time.perf_counter()
+    results = run_batch(options.games, options.workers, options.seed, options.max_frames, overrides, report)
+    elapsed = time.perf_counter() - start
+    summary = summarize(results)
+    frames = sum(r["frames"] for r in results)
+
+    print(f"\n{len(results)} games, {frames} frames in {elapsed:.2f}s on {options.workers} worker(s): "
+          f"{len(results) / elapsed:.1f} games/s, {frames / elapsed:.0f} frames/s")
+    if overrides:
+        print("Overrides: " + ", ".join(f"{name}={value}" for name, value in overrides.items()))
+    print(f"{'metric':<14} {'mean':>9} {'stdev':>9} {'min':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for metric, s in summary.items():
+        print(f"{metric:<14} {s['mean']:>9.2f} {s['stdev']:>9.2f} {s['min']:>9.2f} {s['p50']:>9.2f} {s['p95']:>9.2f} {s['max']:>9.2f}")
+
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump({
+                "games": len(results),
+                "workers": options.workers,
+                "elapsed": elapsed,
+                "overrides": overrides,
+                "summary": summary,
+                "results": sorted(results, key=lambda r: r["seed"]),
+            }, f, indent=4)
+        print(f"Results written to {options.json}")
@@ -0,0 +1,127 @@
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from projectiles import ProjectileSystem, PLAYER
+
+# Compares pygame's sprite collision functions with the ProjectileSystem
+# calls the game loop uses, at the same enemy/bullet mix and playfield size
+# as main.py:
+#   enemies vs player bullets: groupcollide(enemies, bullets, False, True)
+#                              vs ProjectileSystem.collide_sprites
+#   player vs bullets:         spritecollide(player, bullets, True)
+#                              vs ProjectileSystem.collide_rect
+# At 100 entities collide_sprites takes its dense path, from 1k on the
+# grid broadphase (see DENSE_LIMIT in projectiles.py).
+# Both ProjectileSystem calls are timed again with pixel-perfect collisions
+# (PIXEL_COLLISIONS in main.py): one mask per image, shared by every sprite,
+# checked by _refine for each pair whose rects overlap. Enemies ramming the
+# player are timed as the game does them too: spritecollide, then
+# collide_mask on the few enemies it returns.
+# Usage: python bench_collision.py [entity counts...]
+WIDTH, HEIGHT = 800, 600
+REPEATS = 20
+
+def load_image(name, size):
+    # The game's sprite, or a solid rectangle if the assets are not built
+    path = os.path.join('assets', name)
+    if os.path.exists(path):
+        return pygame.transform.scale(pygame.image.load(path), size)
+    image = pygame.Surface(size)
+    image.fill((255, 255, 255))
+    return image
+
+def make_sprites(count, name, size, rng):
+    image = load_image(name, size)
+    mask = pygame.mask.from_surface(image)
+    sprites = []
+    for _ in range(count):
+        sprite = pygame.sprite.Sprite()
+        sprite.image = image
+        sprite.mask = mask
+        sprite.rect = pygame.Rect(rng.randint(0, WIDTH - size[0]), rng.randint(0, HEIGHT - size[1]), *size)
+        sprites.append(sprite)
+    return sprites
+
+def make_projectiles(bullets, masks=False):
+    # The same bullets in a ProjectileSystem; reload() puts them all back after a
+    # collision call has used some up
+    system = ProjectileSystem(WIDTH, HEIGHT, {PLAYER: bullets[0].image}, capacity=len(bullets),
+                              masks={PLAYER: bullets[0].mask} if masks else None)
+    for bullet in bullets:
+        system.spawn(*bullet.rect.center, 0, 0, PLAYER)
+    saved = [arr.copy() for arr in (system.x, system.y, system.owner)]
+
+    def reload():
+        for arr, values in zip((system.x, system.y, system.owner), saved):
+            arr[:] = values
+        system.alive[:] = True
+        system.count = len(bullets)
+
+    return system, reload
+
+def time_call(func, setup, repeats=REPEATS):
+    # Best of repeats; setup runs untimed before every call
+    best = float('inf')
+    for _ in range(repeats):
+        setup()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run(count, seed=1):
+    rng = random.Random(seed)
+    # Enemies are 40x30, the player 50x40 and bullets 5x15, as in the game
+    enemies = make_sprites(count // 2, 'enemy.png', (40, 30), rng)
+    bullets = make_sprites(count - count // 2, 'bullet.png', (5, 15), rng)
+    player = make_sprites(1, 'player.png', (50, 40), rng)[0]
+    player.rect.midbottom = (WIDTH // 2, HEIGHT - 10)
+    enemy_group = pygame.sprite.Group(enemies)
+    bullet_group = pygame.sprite.Group()
+    system, reload = make_projectiles(bullets)
+    masked, reload_masked = make_projectiles(bullets, masks=True)
+
+    def refill():
+        bullet_group.add(bullets)
+
+    def crashed():
+        return [enemy for enemy in pygame.sprite.spritecollide(player, enemy_group, False)
+                if pygame.sprite.collide_mask(player, enemy)]
+
+    repeats = REPEATS if count <= 1000 else 3
+    times = {}
+    times['groupcollide'], group_hits = time_call(
+        lambda: pygame.sprite.groupcollide(enemy_group, bullet_group, False, True), refill, repeats)
+    times['collide_sprites'], system_hits = time_call(lambda: system.collide_sprites(enemies, PLAYER), reload, repeats)
+    if set(group_hits) != set(system_hits):
+        raise AssertionError(f"collide_sprites result differs from groupcollide at {count} entities")
+    times['+ masks'], mask_hits = time_call(lambda: masked.collide_sprites(enemies, PLAYER), reload_masked, repeats)
+    refill()
+    if set(mask_hits) != set(pygame.sprite.groupcollide(enemy_group, bullet_group, False, True,
+                                                       pygame.sprite.collide_mask)):
+        raise AssertionError(f"masked collide_sprites differs from groupcollide with collide_mask at {count} entities")
+
+    times['spritecollide'], sprite_hits = time_call(lambda: pygame.sprite.spritecollide(player, bullet_group, True),
+                                                    refill, repeats)
+    times['collide_rect'], rect_hits = time_call(lambda: system.collide_rect(player.rect, PLAYER), reload, repeats)
+    if len(sprite_hits) != rect_hits:
+        raise AssertionError(f"collide_rect result differs from spritecollide at {count} entities")
+    times['rect + mask'], _ = time_call(lambda: masked.collide_rect(player.rect, PLAYER, player.mask),
+                                        reload_masked, repeats)
+    times['rammed'], _ = time_call(lambda: pygame.sprite.spritecollide(player, enemy_group, False), lambda: None, repeats)
+    times['rammed + mask'], _ = time_call(crashed, lambda: None, repeats)
+    return times, len(system_hits), len(mask_hits)
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]
+    columns = None
+    for count in counts:
+        times, hits, mask_hits = run(count)
+        if columns is None:
+            columns = list(times)
+            print(f"{'entities':>9}" + "".join(f" {name + ' ms':>18}" for name in columns) + f" {'hits':>6} {'mask hits':>10}")
+        print(f"{count:>9}" + "".join(f" {times[name] * 1000:>18.3f}" for name in columns) + f" {hits:>6} {mask_hits:>10}")
@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import main
+
+# A headless game with in-memory stats; it still draws when draw_phase() is called
+game = main.Game(main.parse_args(["--headless"]))
+
+# Frame-cost benchmark for the real game loop.
+# Each scenario seeds every random source, sets up a game state through the
+# same Player / Enemy / PowerUp classes and projectile system the game uses,
+# then steps it for a fixed number of frames with the bot at the controls.
+# The update, collision (including the damage taken), level and draw phases
+# are timed separately, as in Game.step_frame plus drawing. Health is refilled
+# after every frame, so the player never dies and every scenario runs its full
+# length. Not covered: input polling, recording, the frame cap and the
+# display flip, none of which headless runs do.
+# Usage: python benchmark.py [--frames N] [--scenario NAME ...] [--json report.json]
+PHASES = ("update", "collision", "level", "draw")
+PERCENTILES = (50, 95, 99)
+WARMUP_FRAMES = 30
+
+def setup_baseline():
+    # A fresh level 1 game: single shot, six enemies
+    pass
+
+def setup_multishot_level20():
+    # Level 20 with full 8-way fire, and the enemies the level-ups would have added
+    game.level = 20
+    game.player.shoot_power = 8
+    game.player.bullet_spread = 30
+    for _ in range(2 * (game.level - 1)):
+        game.enemy_pool.spawn()
+
+def setup_enemies_500():
+    # 500 enemies spread over the whole screen from the first frame
+    while len(game.enemies) < 500:
+        enemy = game.enemy_pool.spawn()
+        enemy.rect.y = random.randint(0, main.HEIGHT - enemy.rect.height)
+
+def setup_mass_kills():
+    # The 500 enemies against full 8-way fire every step, to push the particle cap
+    setup_enemies_500()
+    game.player.shoot_power = 8
+    game.player.bullet_spread = 30
+    game.player.shoot_delay = 0
+
+def setup_powerups():
+    # Level 5 with power-ups raining down alongside the enemies
+    game.level = 5
+    game.player.shoot_power = 3
+    game.player.bullet_spread = 30
+    for _ in range(20):
+        game.enemy_pool.spawn()
+    for _ in range(8):
+        powerup = game.powerup_pool.spawn()
+        powerup.rect.y = random.randint(0, main.HEIGHT // 2)
+
+SCENARIOS = {
+    "baseline": setup_baseline,
+    "multishot_level20": setup_multishot_level20,
+    "enemies_500": setup_enemies_500,
+    "mass_kills": setup_mass_kills,
+    "powerups": setup_powerups,
+}
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(samples):
+    ordered = sorted(samples)
+    summary = {f"p{pct}": percentile(ordered, pct) * 1000 for pct in PERCENTILES}
+    summary["mean"] = sum(ordered) / len(ordered) * 1000 if ordered else 0.0
+    summary["max"] = ordered[-1] * 1000 if ordered else 0.0
+    return summary
+
+def run_scenario(name, frames, seed):
+    game.new_game(seed)
+    SCENARIOS[name]()
+    game.renderer.invalidate()
+
+    timings = {phase: [] for phase in PHASES + ("frame",)}
+    peak_enemies = peak_bullets = peak_particles = 0
+    clock = time.perf_counter
+    for frame in range(WARMUP_FRAMES + frames):
+        game.game_clock.step()
+        start = clock()
+        game.update_phase()
+        updated = clock()
+        game.take_damage(game.collision_phase())
+        collided = clock()
+        game.level_phase()
+        levelled = clock()
+        game.draw_phase()
+        drawn = clock()
+        # Keep the player alive so every scenario lasts the same number of frames
+        game.player.health = 5
+        if frame < WARMUP_FRAMES:
+            continue
+        timings["update"].append(updated - start)
+        timings["collision"].append(collided - updated)
+        timings["level"].append(levelled - collided)
+        timings["draw"].append(drawn - levelled)
+        timings["frame"].append(drawn - start)
+        peak_enemies = max(peak_enemies, len(game.enemies))
+        peak_bullets = max(peak_bullets, game.projectiles.count)
+        peak_particles = max(peak_particles, game.particles.count)
+
+    return {
+        "frames": frames,
+        "seed": seed,
+        "peak_enemies": peak_enemies,
+        "peak_bullets": peak_bullets,
+        "peak_particles": peak_particles,
+        "score": game.score,
+        "phases": {phase: summarize(samples) for phase, samples in timings.items()},
+    }
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+def print_table(results):
+    print(f"{'scenario':<20} {'phase':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    for name, result in results.items():
+        for phase in PHASES + ("frame",):
+            s = result["phases"][phase]
+            print(f"{name:<20} {phase:<10} {s['p50']:>8.3f} {s['p95']:>8.3f} {s['p99']:>8.3f} {s['mean']:>8.3f}")
+        print(f"{'':<20} peak {result['peak_enemies']} enemies, {result['peak_bullets']} bullets, {result['peak_particles']} particles")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Space Shooter frame-cost benchmark")
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per scenario")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run; repeat for several (default: all)")
+    parser.add_argument("--json", help="write the report to this file")
+    options = parser.parse_args()
+
+    results = {}
+    for name in options.scenario or SCENARIOS:
+        results[name] = run_scenario(name, options.frames, options.seed)
+    print_table(results)
+
+    if options.json:
+        report = {
+            "commit": git_commit(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "pygame": main.pygame.version.ver,
+            "platform": platform.platform(),
+            "render_mode": game.renderer.mode,
+            "warmup_frames": WARMUP_FRAMES,
+            "scenarios": results,
+        }
+        with open(options.json, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"Report written to {options.json}")
+    main.pygame.quit()
@@ -0,0 +1,170 @@
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Incremental asset build for everything create_sprites.py and
+# create_sounds.py generate.
+# Each target's key is a hash of its generator's source files, its
+# parameters, its outputs and the keys of the targets it depends on. A
+# target is rebuilt only when its key differs from the manifest or an
+# output is missing. Targets whose dependencies are done run together in a
+# process pool. main.py calls check_manifest() at startup, which only hashes
+# a few small source files and never imports a generator.
+# Usage: python build_assets.py [--force] [--jobs N] [--check]
+MANIFEST = os.path.join('assets', 'manifest.json')
+BUILD_VERSION = 1
+
+SPRITE_SOURCES = ['create_sprites.py']
+SOUND_SOURCES = ['create_sounds.py', 'sound_bank.py']
+
+# name -> generator ("module:function"), keyword parameters, outputs, sources, deps
+TARGETS = {
+    'player': {'build': 'create_sprites:create_player', 'params': {},
+               'outputs': ['assets/player.png'], 'sources': SPRITE_SOURCES},
+    'enemy': {'build': 'create_sprites:create_enemy', 'params': {},
+              'outputs': ['assets/enemy.png'], 'sources': SPRITE_SOURCES},
+    'bullet': {'build': 'create_sprites:create_bullet', 'params': {'is_player': True},
+               'outputs': ['assets/bullet.png'], 'sources': SPRITE_SOURCES},
+    'enemy_bullet': {'build': 'create_sprites:create_bullet', 'params': {'is_player': False},
+                     'outputs': ['assets/enemy_bullet.png'], 'sources': SPRITE_SOURCES},
+    'firework': {'build': 'create_sprites:create_firework', 'params': {'seed': 1},
+                 'outputs': ['assets/firework.png'], 'sources': SPRITE_SOURCES},
+    'atlas': {'build': 'create_sprites:build_atlas', 'params': {},
+              'outputs': ['assets/atlas.png', 'assets/atlas.json'], 'sources': SPRITE_SOURCES,
+              'deps': ['player', 'enemy', 'bullet', 'enemy_bullet', 'firework']},
+    'shoot_sound': {'build': 'create_sounds:create_sound', 'params': {'name': 'shoot'},
+                    'outputs': ['sounds/shoot.wav'], 'sources': SOUND_SOURCES},
+    'enemy_shoot_sound': {'build': 'create_sounds:create_sound', 'params': {'name': 'enemy_shoot'},
+                          'outputs': ['sounds/enemy_shoot.wav'], 'sources': SOUND_SOURCES},
+    'powerup_sound': {'build': 'create_sounds:create_sound', 'params': {'name': 'powerup'},
+                      'outputs': ['sounds/powerup.wav'], 'sources': SOUND_SOURCES},
+}
+
+def file_hash(path, cache):
+    digest = cache.get(path)
+    if digest is None:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        cache[path] = digest
+    return digest
+
+def target_keys(root='.'):
+    # name -> key for every target; dependencies are hashed in first
+    keys = {}
+    file_hashes = {}
+
+    def key(name):
+        if name not in keys:
+            target = TARGETS[name]
+            parts = [str(BUILD_VERSION), target['build'], json.dumps(target['params'], sort_keys=True)]
+            parts += target['outputs']
+            parts += [file_hash(os.path.join(root, source), file_hashes) for source in target['sources']]
+            parts += [key(dep) for dep in target.get('deps', [])]
+            keys[name] = hashlib.sha256("|".join(parts).encode()).hexdigest()
+        return keys[name]
+
+    for name in TARGETS:
+        key(name)
+    return keys
+
+def load_manifest(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('targets', {})
+    except (OSError, ValueError):
+        return {}
+
+def stale_targets(root='.', manifest_path=None):
+    manifest = load_manifest(os.path.join(root, manifest_path or MANIFEST))
+    keys = target_keys(root)
+    stale = []
+    for name, key in keys.items():
+        entry = manifest.get(name)
+        outputs_present = all(os.path.exists(os.path.join(root, out)) for out in TARGETS[name]['outputs'])
+        if entry is None or entry.get('key') != key or not outputs_present:
+            stale.append(name)
+    return stale
+
+def check_manifest(root='.'):
+    # Names of targets whose outputs are missing or out of date; [] when all is current
+    try:
+        return stale_targets(root)
+    except OSError:
+        # A generator source is missing, e.g. in a trimmed install; nothing to compare
+        return []
+
+def run_target(name):
+    target = TARGETS[name]
+    module_name, function_name = target['build'].split(':')
+    start = time.perf_counter()
+    function = getattr(importlib.import_module(module_name), function_name)
+    function(**target['params'])
+    return name, time.perf_counter() - start
+
+def build(force=False, jobs=None):
+    keys = target_keys()
+    stale = set(TARGETS) if force else set(stale_targets())
+    # Anything that depends on a stale target is stale too
+    changed = True
+    while changed:
+        changed = False
+        for name, target in TARGETS.items():
+            if name not in stale and stale.intersection(target.get('deps', [])):
+                stale.add(name)
+                changed = True
+
+    manifest = load_manifest(MANIFEST)
+    done = set(TARGETS) - stale
+    failed = set()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while stale - failed:
+            # Every stale target whose dependencies are all built
+            ready = [name for name in TARGETS if name in stale and name not in failed
+                     and all(dep in done for dep in TARGETS[name].get('deps', []))]
+            if not ready:
+                break
+            futures = {name: pool.submit(run_target, name) for name in ready}
+            for name, future in futures.items():
+                try:
+                    _, seconds = future.result()
+                except Exception as e:
+                    print(f"  {name}: FAILED ({e})")
+                    failed.add(name)
+                    continue
+                print(f"  {name}: built in {seconds * 1000:.0f} ms")
+                stale.discard(name)
+                done.add(name)
+                manifest[name] = {'key': keys[name], 'outputs': TARGETS[name]['outputs']}
+
+    for name in stale - failed:
+        print(f"  {name}: skipped, a dependency failed")
+    # Only targets that are current go in the manifest
+    manifest = {name: entry for name, entry in manifest.items() if name in done}
+    with open(MANIFEST + '.tmp', 'w') as f:
+        json.dump({'version': BUILD_VERSION, 'targets': manifest}, f, indent=2, sort_keys=True)
+    os.replace(MANIFEST + '.tmp', MANIFEST)
+    return stale
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the game's sprites and sounds")
+    parser.add_argument("--force", action="store_true", help="rebuild every target")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--check", action="store_true", help="only report stale targets; exit status 1 if any")
+    options = parser.parse_args()
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    if options.check:
+        stale = stale_targets()
+        print("Assets are up to date" if not stale else "Stale: " + ", ".join(stale))
+        sys.exit(1 if stale else 0)
+
+    start = time.perf_counter()
+    os.makedirs('assets', exist_ok=True)
+    left = build(options.force, options.jobs)
+    print(f"Asset build finished in {time.perf_counter() - start:.2f}s" + (f", {len(left)} target(s) failed" if left else ""))
+    sys.exit(1 if left else 0)
@@ -0,0 +1,105 @@
+from collections import namedtuple
+import pygame
+
+# What the player ship is told to do this frame
+Controls = namedtuple('Controls', ['left', 'right', 'up', 'down', 'fire'])
+IDLE = Controls(False, False, False, False, False)
+
+KEY_NAMES = ('LEFT', 'RIGHT', 'UP', 'DOWN', 'FIRE')
+
+# Controls packed into one byte, bit i = KEY_NAMES[i], for input recordings
+def to_mask(controls):
+    mask = 0
+    for bit, held in enumerate(controls):
+        if held:
+            mask |= 1 << bit
+    return mask
+
+def from_mask(mask):
+    return Controls(*(bool(mask & (1 << bit)) for bit in range(len(KEY_NAMES))))
+
+# Input sources: poll(player, enemies) returns the Controls for one frame.
+
+# Arrow keys and space from the real keyboard
+class KeyboardInput:
+    def poll(self, player, enemies):
+        keys = pygame.key.get_pressed()
+        return Controls(
+            keys[pygame.K_LEFT],
+            keys[pygame.K_RIGHT],
+            keys[pygame.K_UP],
+            keys[pygame.K_DOWN],
+            keys[pygame.K_SPACE]
+        )
+
+# Replays a text script, looping at the end. Each line is a frame count
+# followed by the keys held for those frames, e.g. "30 LEFT FIRE".
+class ScriptedInput:
+    def __init__(self, steps):
+        # steps: list of (frames, Controls)
+        self.steps = steps or [(1, IDLE)]
+        self.step = 0
+        self.left_in_step = self.steps[0][0]
+
+    @classmethod
+    def from_file(cls, path):
+        steps = []
+        with open(path, 'r') as f:
+            for line in f:
+                parts = line.split('#', 1)[0].split()
+                if not parts:
+                    continue
+                held = {name.upper() for name in parts[1:]}
+                unknown = held - set(KEY_NAMES)
+                if unknown:
+                    raise ValueError(f"Unknown key(s) {sorted(unknown)} in {path}")
+                frames = int(parts[0])
+                if frames < 1:
+                    raise ValueError(f"Frame count must be at least 1, got {frames} in {path}")
+                steps.append((frames, Controls(*(name in held for name in KEY_NAMES))))
+        return cls(steps)
+
+    def poll(self, player, enemies):
+        while self.left_in_step <= 0:
+            self.step = (self.step + 1) % len(self.steps)
+            self.left_in_step = self.steps[self.step][0]
+        self.left_in_step -= 1
+        return self.steps[self.step][1]
+
+# Simple autopilot: keeps low, lines up under the closest on-screen enemy,
+# sidesteps enemies that are about to ram it, and fires constantly
+class BotInput:
+    def __init__(self, screen_height=600, danger_distance=140):
+        self.screen_height = screen_height
+        self.danger_distance = danger_distance
+
+    def poll(self, player, enemies):
+        rect = player.rect
+        target = None
+        threat = None
+        for enemy in enemies:
+            if enemy.rect.bottom <= 0:
+                continue
+            if target is None or abs(enemy.rect.centerx - rect.centerx) < abs(target.rect.centerx - rect.centerx):
+                target = enemy
+            below_gap = rect.top - enemy.rect.bottom
+            if 0 <= below_gap < self.danger_distance and abs(enemy.rect.centerx - rect.centerx) < rect.width:
+                threat = enemy
+
+        left = right = False
+        if threat is not None:
+            # Dodge to whichever side is farther from the threat
+            left = threat.rect.centerx >= rect.centerx
+            right = not left
+        elif target is not None:
+            left = target.rect.centerx < rect.centerx - 4
+            right = target.rect.centerx > rect.centerx + 4
+        down = rect.bottom < self.screen_height - 10
+        return Controls(left, right, False, down, True)
+
+def make_input(name, script=None, screen_height=600):
+    if name == 'bot':
+        return BotInput(screen_height)
+    if name == 'script':
+        return ScriptedInput.from_file(script)
+    return KeyboardInput()
@@ -2,6 +2,8 @@ import pygame
 import os
 import math
 import random
+import json
+import build_assets
 
 # Initialize Pygame
 pygame.init()
@@ -20,6 +22,18 @@ PURPLE = (128, 0, 128)
 GRAY = (128, 128, 128)
 LIGHT_GRAY = (200, 200, 200)
 
+# Sizes the sprites are drawn at in the game (width, height)
+GAME_SIZES = {
+    'player.png': (50, 40),
+    'enemy.png': (40, 30),
+    'bullet.png': (5, 15),
+    'enemy_bullet.png': (5, 10),
+    'firework.png': (32, 32),
+}
+
+ATLAS_WIDTH = 128
+ATLAS_PADDING = 1
+
 # Create assets directory
 if not os.path.exists('assets'):
     os.makedirs('assets')
@@ -51,6 +65,7 @@ def create_player():
     
     # Save image
     pygame.image.save(surface, 'assets/player.png')
+    return surface
 
 def create_enemy():
     # Create enemy airplane with adjusted proportions
@@ -79,6 +94,7 @@ def create_enemy():
     
     # Save image
     pygame.image.save(surface, 'assets/enemy.png')
+    return surface
 
 def create_bullet(is_player=True):
     # Create bullet with trail effect
@@ -102,28 +118,63 @@ def create_bullet(is_player=True):
     # Save image
     filename = 'bullet.png' if is_player else 'enemy_bullet.png'
     pygame.image.save(surface, f'assets/{filename}')
+    return surface
 
-def create_firework():
-    # Create firework explosion
+def create_firework(seed=None):
+    # Create firework explosion; a seed makes the particle layout reproducible
+    rng = random.Random(seed)
     surface = pygame.Surface((120, 120), pygame.SRCALPHA)  # Increased size
     
     # Draw explosion particles
     colors = [RED, ORANGE, YELLOW, PURPLE]
     for i in range(30):  # More particles
-        angle = random.uniform(0, 2 * math.pi)
-        distance = random.uniform(20, 50)  # Increased range
+        angle = rng.uniform(0, 2 * math.pi)
+        distance = rng.uniform(20, 50)  # Increased range
         x = 60 + math.cos(angle) * distance
         y = 60 + math.sin(angle) * distance
-        color = random.choice(colors)
-        size = random.randint(2, 4)  # Varying sizes
+        color = rng.choice(colors)
+        size = rng.randint(2, 4)  # Varying sizes
         pygame.draw.circle(surface, color, (int(x), int(y)), size)
     
     # Save image
     pygame.image.save(surface, 'assets/firework.png')
+    return surface
+
+def pack_shelves(sizes, width=ATLAS_WIDTH, padding=ATLAS_PADDING):
+    # Simple shelf packer: tallest sprites first, left to right, new row when full
+    frames = {}
+    x = y = shelf_height = 0
+    for name, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if x + w > width:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        frames[name] = (x, y, w, h)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+    return frames, (width, y + shelf_height)
+
+def create_atlas(sprites):
+    # Pack every sprite at its in-game size into one image plus a small JSON index
+    frames, atlas_size = pack_shelves(GAME_SIZES)
+    atlas = pygame.Surface(atlas_size, pygame.SRCALPHA)
+    for name, (x, y, w, h) in frames.items():
+        atlas.blit(pygame.transform.smoothscale(sprites[name], (w, h)), (x, y))
+    pygame.image.save(atlas, 'assets/atlas.png')
+
+    metadata = {
+        "image": "atlas.png",
+        "frames": {name: list(rect) for name, rect in sorted(frames.items())}
+    }
+    with open('assets/atlas.json', 'w') as f:
+        json.dump(metadata, f, separators=(',', ':'))
+
+def build_atlas():
+    # Atlas from the sprite files already in assets/, for build_assets.py
+    create_atlas({name: pygame.image.load(os.path.join('assets', name)) for name in GAME_SIZES})
 
 if __name__ == '__main__':
-    create_player()
-    create_enemy()
-    create_bullet(True)  # Player bullet
-    create_bullet(False)  # Enemy bullet
-    create_firework()
\ No newline at end of file
+    # Same as build_assets.py --force, so the manifest stays in step with assets/
+    # and the firework gets the pipeline's fixed seed
+    os.makedirs('assets', exist_ok=True)
+    build_assets.build(force=True)
@@ -0,0 +1,90 @@
+import time
+import pygame
+
+# Fixed-timestep clock for the game loop.
+# The simulation always advances in steps of exactly 1/fps seconds and all
+# game time (shot cadence, shield timers, play time) is counted in those
+# steps, so the game runs at the same speed whatever the render rate.
+# Realtime mode: advance() is called once per rendered frame, adds the real
+# time that passed to an accumulator and returns how many steps are due;
+# alpha() is how far the next step has progressed, for render interpolation.
+# A slow machine renders fewer frames and runs several steps per frame; past
+# max_steps per frame the extra time is dropped instead of piling up.
+# speed scales how much game time passes per real second (fast-forward).
+# Game time restarts at 0 for every game, so a game's timers do not depend
+# on how many steps earlier games ran.
+# Uncapped mode never sleeps: every advance() is exactly one step, so the
+# game logic behaves the same while running as fast as the CPU allows.
+class GameClock:
+    def __init__(self, fps, realtime=True, render_fps=0, max_steps=5, speed=1.0):
+        self.fps = fps
+        self.realtime = realtime
+        self.render_fps = render_fps
+        self.speed = speed
+        self.max_steps = max(1, int(max_steps * speed))
+        self.step_seconds = 1.0 / fps
+        self.frame_ms = 1000.0 / fps
+        self.frames = 0
+        self.game_start = 0
+        self.rendered = 0
+        self.dropped = 0
+        self.accumulator = 0.0
+        self.clock = pygame.time.Clock() if realtime else None
+        self.started = time.perf_counter()
+        self.last = self.started
+
+    def start(self):
+        # Restart the wall-clock measurement, e.g. once loading is done
+        self.started = time.perf_counter()
+        self.resume()
+
+    def resume(self):
+        # Forget time spent outside the game loop (menus, game over screen)
+        self.last = time.perf_counter()
+        self.accumulator = 0.0
+
+    def reset_game_time(self):
+        self.game_start = self.frames
+
+    def advance(self):
+        # Number of simulation steps to run before drawing this frame
+        self.rendered += 1
+        if not self.realtime:
+            return 1
+        if self.render_fps:
+            self.clock.tick(self.render_fps)
+        now = time.perf_counter()
+        self.accumulator += (now - self.last) * self.speed
+        self.last = now
+        steps = int(self.accumulator / self.step_seconds)
+        if steps > self.max_steps:
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_seconds
+        return steps
+
+    def step(self):
+        self.frames += 1
+
+    def alpha(self):
+        # 0..1: progress from the previous simulation step to the current one
+        if not self.realtime:
+            return 1.0
+        return min(self.accumulator / self.step_seconds, 1.0)
+
+    def ticks(self):
+        # Milliseconds of simulated time in this game, like pygame.time.get_ticks()
+        return int((self.frames - self.game_start) * self.frame_ms)
+
+    def seconds(self):
+        return self.ticks() / 1000.0
+
+    def wall_seconds(self):
+        return time.perf_counter() - self.started
+
+    def frames_per_second(self):
+        # Simulation steps actually run per wall-clock second
+        elapsed = self.wall_seconds()
+        return self.frames / elapsed if elapsed > 0 else 0.0
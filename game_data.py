@@ -1,10 +1,25 @@
-import json
-import os
+import copy
+import sqlite3
+import threading
 from datetime import datetime
+from storage import EVENT_KEYS, JsonStorage, JournalStorage, SqliteStorage
 
 class GameData:
-    def __init__(self):
-        self.data_file = "game_data.json"
+    # storage: "journal" (game_data.json snapshot + append-only event journal),
+    # "json" (game_data.json rewritten on every change), "sqlite" (full session
+    # history in db_file, imported from data_file on first use) or any backend
+    # object from storage.py
+    def __init__(self, data_file="game_data.json", write_behind=False, flush_interval=5.0,
+                 storage="journal", db_file="game_data.db"):
+        self.data_file = data_file
+        if storage == "journal":
+            self.storage = JournalStorage(data_file)
+        elif storage == "json":
+            self.storage = JsonStorage(data_file)
+        elif storage == "sqlite":
+            self.storage = SqliteStorage(db_file, legacy_json=data_file)
+        else:
+            self.storage = storage
         self.default_data = {
             "high_scores": [],
             "total_play_time": 0,
@@ -17,48 +32,114 @@ class GameData:
             "last_played": None,
             "settings": {
                 "sound_volume": 0.3,
-                "difficulty": "normal"
+                "difficulty": "normal",
+                "render_mode": "flip",
+                "quality": "high",
+                "auto_quality": True
             }
         }
         self.data = self.load_data()
 
+        # Write-behind: mutations only mark the data dirty and a background
+        # thread writes it at most every flush_interval seconds
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()
+        self.dirty = False
+        # Aggregate keys changed since the last save, for backends that save per key
+        self.changed = set()
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.stop_event = threading.Event()
+        self.writer = None
+        if write_behind:
+            self.writer = threading.Thread(target=self._writer_loop, name="GameDataWriter", daemon=True)
+            self.writer.start()
+
     def load_data(self):
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return self.default_data.copy()
-        return self.default_data.copy()
+        data = self.storage.load()
+        if data is None:
+            return copy.deepcopy(self.default_data)
+        # Fill in keys and settings added after the data was written
+        for key, value in self.default_data.items():
+            data.setdefault(key, copy.deepcopy(value))
+        for key, value in self.default_data["settings"].items():
+            data["settings"].setdefault(key, value)
+        return data
 
     def save_data(self):
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=4)
+        # Snapshot under the lock, write outside it so the game never waits on disk.
+        # The changed keys are taken with the snapshot, so a change made after it
+        # stays pending for the next save.
+        with self.lock:
+            snapshot = copy.deepcopy(self.data)
+            keys, self.changed = self.changed, set()
+            self.dirty = False
+        try:
+            with self.write_lock:
+                self.storage.save(snapshot, keys)
+        except BaseException:
+            # Keep the changes pending so the next flush tries again
+            with self.lock:
+                self.changed |= keys
+                self.dirty = True
+            raise
+
+    def _record(self, event):
+        # Apply one stat event; the backend says whether a full save is due
+        with self.lock:
+            if self.storage.apply(self.data, event):
+                self.changed.update(EVENT_KEYS[event["ev"]])
+                self._changed()
+
+    def _changed(self):
+        if self.write_behind:
+            self.dirty = True
+        else:
+            self.save_data()
+
+    def _writer_loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except (OSError, sqlite3.Error) as e:
+                # e.g. a full disk or a locked database; retried on the next interval
+                print(f"Warning: could not save game data: {e}")
+
+    def flush(self):
+        # Write pending changes now; called at game end and on shutdown
+        if self.dirty:
+            self.save_data()
+
+    def close(self):
+        self.stop_event.set()
+        if self.writer is not None:
+            self.writer.join()
+            self.writer = None
+        self.flush()
+        self.storage.close()
 
-    def add_high_score(self, score, level):
-        self.data["high_scores"].append({
+    def add_high_score(self, score, level, kills=0, play_time=0, powerups=None):
+        # Records a finished game; the JSON backends only keep the top 10
+        self._record({"ev": "session_end", "session": {
             "score": score,
             "level": level,
+            "kills": kills,
+            "play_time": play_time,
+            "powerups": powerups or {},
+            "difficulty": self.data["settings"]["difficulty"],
             "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        })
-        # Keep only top 10 scores
-        self.data["high_scores"] = sorted(
-            self.data["high_scores"],
-            key=lambda x: x["score"],
-            reverse=True
-        )[:10]
-        self.save_data()
+        }})
 
     def update_stats(self, play_time, kills, powerup_type=None):
-        self.data["total_play_time"] += play_time
-        self.data["total_kills"] += kills
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if play_time or kills or not powerup_type:
+            self._record({"ev": "kill", "kills": kills, "play_time": play_time, "at": now})
         if powerup_type:
-            self.data["powerups_collected"][powerup_type] += 1
-        self.data["last_played"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.save_data()
+            self._record({"ev": "powerup", "type": powerup_type, "at": now})
 
-    def get_high_scores(self):
-        return self.data["high_scores"]
+    def get_high_scores(self, limit=10, day=None, difficulty=None):
+        # day is a "YYYY-MM-DD" string
+        return self.storage.top_scores(self.data, limit, day=day, difficulty=difficulty)
 
     def get_stats(self):
         return {
@@ -69,8 +150,7 @@ class GameData:
         }
 
     def update_settings(self, settings):
-        self.data["settings"].update(settings)
-        self.save_data()
+        self._record({"ev": "settings", "settings": dict(settings)})
 
     def get_settings(self):
-        return self.data["settings"] 
\ No newline at end of file
+        return self.data["settings"]
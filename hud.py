@@ -0,0 +1,85 @@
+import pygame
+
+# Font wrapper whose render() goes through the shared TextCache,
+# so it can stand in for a pygame.font.Font in menu code
+class CachedFont:
+    def __init__(self, cache, point_size, font):
+        self.cache = cache
+        self.point_size = point_size
+        self.font = font
+
+    def render(self, text, antialias, color):
+        return self.cache.render(text, self.point_size, color, antialias)
+
+    def size(self, text):
+        return self.font.size(text)
+
+# Shared fonts and rendered text.
+# pygame.font.Font objects are created once per size and rendered strings are
+# kept by (text, size, color), so menus and the HUD never re-render text that
+# has not changed. The oldest entries are dropped past max_entries.
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = {}
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = CachedFont(self, size, pygame.font.Font(None, size))
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color, antialias=True):
+        key = (text, size, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        if len(self.surfaces) >= self.max_entries:
+            del self.surfaces[next(iter(self.surfaces))]
+        surface = self.font(size).font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        return surface
+
+# In-game status line made of separately rendered fields.
+# set() only re-renders a field when its value actually changes; draw() just
+# blits the cached surfaces left to right.
+class Hud:
+    def __init__(self, text_cache, pos=(10, 10), size=36, color=(255, 255, 255)):
+        self.text_cache = text_cache
+        self.pos = pos
+        self.size = size
+        self.color = color
+        self.formats = {}
+        self.values = {}
+        self.surfaces = {}
+        self.gap = text_cache.font(size).size("  ")[0]
+        self.renders = 0
+
+    def add_field(self, name, fmt):
+        self.formats[name] = fmt
+
+    def set(self, name, value):
+        if name in self.values and self.values[name] == value:
+            return
+        self.values[name] = value
+        # Values change constantly, so they bypass the shared string cache
+        font = self.text_cache.font(self.size).font
+        self.surfaces[name] = font.render(self.formats[name].format(value), True, self.color)
+        self.renders += 1
+
+    def draw(self, surface):
+        # Returns the rects blitted, for dirty-rect rendering
+        x, y = self.pos
+        rects = []
+        for name in self.formats:
+            image = self.surfaces.get(name)
+            if image is not None:
+                rects.append(surface.blit(image, (x, y)))
+                x += image.get_width() + self.gap
+        return rects
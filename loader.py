@@ -0,0 +1,51 @@
+import threading
+import time
+
+# Startup work that can happen while the title screen is up.
+# Tasks run one after another on a single background thread, in the order
+# they were added, so a later task can rely on an earlier one (sounds use
+# the volume from the saved settings). wait(name) blocks until that task
+# has finished and re-raises anything it raised; run() does everything on
+# the calling thread instead, for headless runs.
+class BackgroundLoader:
+    def __init__(self):
+        self.tasks = []
+        self.finished = {}
+        self.errors = {}
+        self.timings = {}
+        self.thread = None
+
+    def add(self, name, func):
+        self.tasks.append((name, func))
+        self.finished[name] = threading.Event()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="loader", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        for name, func in self.tasks:
+            if self.finished[name].is_set():
+                continue
+            start = time.perf_counter()
+            try:
+                func()
+            except Exception as e:
+                self.errors[name] = e
+            finally:
+                self.timings[name] = time.perf_counter() - start
+                self.finished[name].set()
+
+    def done(self, name=None):
+        if name is not None:
+            return self.finished[name].is_set()
+        return all(event.is_set() for event in self.finished.values())
+
+    def wait(self, name=None):
+        if self.thread is None:
+            self.run()
+        names = [name] if name is not None else [task for task, _ in self.tasks]
+        for task in names:
+            self.finished[task].wait()
+            if task in self.errors:
+                raise self.errors[task]
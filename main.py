@@ -1,26 +1,93 @@
 # Essential Imports
+import time
+STARTUP_BEGIN = time.perf_counter()
+import argparse
+import os
 import pygame
 import random
 import math
-import os
+from functools import partial
 from pygame import mixer
 from game_data import GameData
-import time
-
-# Initialize Pygame and mixer for sound
-pygame.init()
-mixer.init()
-
-# Initialize game data
-game_data = GameData()
-settings = game_data.get_settings()
+from storage import MemoryStorage
+from asset_cache import AssetCache
+from sprite_pool import SpritePool, PooledSprite
+from starfield import Starfield
+from projectiles import ProjectileSystem, PLAYER, ENEMY
+from particles import ParticleSystem
+from rendering import Renderer, remember_positions, draw_interpolated
+from hud import TextCache, Hud
+from controls import make_input
+from replay import Recording, RecordingInput, ReplayInput
+from game_clock import GameClock
+from profiler import FrameProfiler, ProfilerOverlay
+from audio import AudioManager
+from sound_bank import SoundBank
+from build_assets import check_manifest
+from loader import BackgroundLoader
+from quality import QualityGovernor
+
+# Command line: normal windowed play, or a headless uncapped simulation
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Space Shooter")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window, no audio device, no rendering; simulate as fast as possible")
+    parser.add_argument("--input", choices=["keyboard", "bot", "script"], default=None,
+                        help="player input source (default: keyboard, or bot when headless)")
+    parser.add_argument("--script", help="input script for --input script (lines like '30 LEFT FIRE')")
+    parser.add_argument("--frames", type=int, default=0, help="stop after this many frames (0 = no limit)")
+    parser.add_argument("--games", type=int, default=1, help="headless: number of games to play")
+    parser.add_argument("--seed", type=int, help="RNG seed for the game (default: a fresh one each game)")
+    parser.add_argument("--record", metavar="PATH", help="record each game's seed and inputs (game 2 onwards go to PATH-2, ...)")
+    parser.add_argument("--replay", metavar="PATH", help="re-run a recorded game; combine with --headless for full speed")
+    parser.add_argument("--speed", type=float, default=1.0, help="game speed multiplier when not headless, e.g. 8 for a fast replay")
+    parser.add_argument("--profile", action="store_true", help="start with the frame profiler overlay on (F3 toggles it)")
+    parser.add_argument("--profile-csv", metavar="PATH", help="time every frame and write the per-phase timings to PATH on exit")
+    args = parser.parse_args(argv)
+    if args.input == "script" and not args.script:
+        parser.error("--input script needs --script PATH")
+    # Seeds are stored as unsigned 64-bit numbers in recordings
+    if args.seed is not None and not 0 <= args.seed < 2 ** 64:
+        parser.error("--seed must be between 0 and 2**64 - 1")
+    # The game clock only advances whole steps, so a speed of 0 or less never plays a frame
+    if not 0 < args.speed < math.inf:
+        parser.error("--speed must be a number greater than 0")
+    return args
+
+# Game data: stats are written by a background thread, not the frame loop.
+# Every session is kept in SQLite; an existing game_data.json is imported on first run.
+# Headless runs and replays keep their stats in memory so they never touch the saved records.
+STORAGE_BACKEND = "sqlite"
 
 # Game window setup
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Space Shooter")
-clock = pygame.time.Clock()
-FPS = 60  # Frames per second
+FPS = 60  # Simulation steps per second; all movement and timers count these
+RENDER_FPS = 120  # Cap on drawn frames per second; positions are interpolated between steps
+
+# Object pool sizes; spawning past these still works but counts as pool exhaustion
+ENEMY_POOL_SIZE = 64
+POWERUP_POOL_SIZE = 8
+
+# Initial projectile slots; the arrays double when a bullet-hell needs more
+PROJECTILE_CAPACITY = 1024
+BULLET_SPEED = -10
+ENEMY_BULLET_SPEED = 5
+
+# Hits on the player, enemies and bullets test their shared per-image masks once
+# the rects overlap, so transparent corners of the sprites no longer count
+PIXEL_COLLISIONS = True
+
+# Explosion particles: every kill and every hit on the player throws out a burst,
+# but no more than MAX_PARTICLES are ever alive at once
+MAX_PARTICLES = 600
+KILL_PARTICLES = 12
+DAMAGE_PARTICLES = 24
+
+# Balance knobs (batch_sim.py can override them with --set NAME=VALUE)
+ENEMY_SHOOT_DELAY = (1500, 3000)  # ms, picked at random per enemy
+POWERUP_DROP_CHANCE = 0.2  # per enemy killed
+LEVEL_SCORE_STEP = 100  # level n ends past n * LEVEL_SCORE_STEP points
+LEVEL_UP_ENEMIES = 2  # extra enemies per level
 
 # Define common colors
 WHITE = (255, 255, 255)
@@ -30,65 +97,50 @@ ORANGE = (255, 165, 0)
 CYAN = (0, 255, 255)
 PURPLE = (128, 0, 128)
 
-# Load Sounds (with error handling)
-shoot_sound = None
-powerup_sound = None
-enemy_shoot_sound = None
-try:
-    shoot_sound = mixer.Sound('sounds/shoot.wav')
-    shoot_sound.set_volume(settings["sound_volume"])
-    powerup_sound = mixer.Sound('sounds/powerup.wav')
-    powerup_sound.set_volume(settings["sound_volume"])
-    enemy_shoot_sound = mixer.Sound('sounds/enemy_shoot.wav')
-    enemy_shoot_sound.set_volume(settings["sound_volume"])
-except:
-    print("Warning: Sounds not loaded correctly.")
-
-# Load image helper function
-# If image not found, returns a colored rectangle fallback
-
-def load_image(name, fallback_color=(255, 255, 255), size=(50, 40)):
-    path = os.path.join('assets', name)
-    if os.path.exists(path):
-        image = pygame.image.load(path)
-        return pygame.transform.scale(image, size)
-    else:
-        surface = pygame.Surface(size)
-        surface.fill(fallback_color)
-        return surface
-
-# Load background image
-background_img = load_image('background.jpg', fallback_color=(0, 0, 30), size=(WIDTH, HEIGHT))
-
-# Background starfield class for aesthetic effect
-class Star:
-    def __init__(self):
-        self.x = random.randint(0, WIDTH)
-        self.y = random.randint(0, HEIGHT)
-        self.size = random.randint(1, 3)
-        self.speed = random.uniform(0.5, 2)
-        self.color = (255, 255, 255)
-
-    def update(self):
-        self.y += self.speed
-        if self.y > HEIGHT:
-            self.y = 0
-            self.x = random.randint(0, WIDTH)
-
-    def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.size)
-
-stars = [Star() for _ in range(100)]  # Create 100 background stars
+# Sound effects: reserved mixer channels per category, capped voices per sound.
+# They are synthesized in memory (cached in .sound_cache); shots come in a few
+# pitches so rapid fire sounds less repetitive. sounds/*.wav is the fallback.
+SOUND_CHANNELS = {"powerup": 2, "player": 3, "enemy": 3}
+SHOT_PITCHES = (0.94, 1.0, 1.06)
+
+# Every image the game uses, warmed up while the start screen is shown
+PRELOAD_IMAGES = [
+    ('player.png', BLUE, (50, 40)),
+    ('bullet.png', WHITE, (5, 15)),
+    ('enemy_bullet.png', RED, (5, 10)),
+    ('enemy.png', RED, (40, 30)),
+    ('firework.png', ORANGE, (32, 32)),
+]
+
+# Background parallax starfield for aesthetic effect (NumPy-backed, cheap at thousands of stars)
+STAR_COUNT = 300
+
+# Frame profiler: F3 toggles timing and the overlay; --profile-csv times every frame
+PROFILE_PHASES = ("events", "update", "collision", "level", "save", "draw", "flip")
+
+# Adaptive quality, cheapest level first. With the "auto_quality" setting on,
+# the governor steps down a level when frames run over the 1000 / FPS ms budget
+# and back up when there is room again. Only cosmetics change, so seeded games
+# and replays play out the same at every level. The level in use is saved
+# as the "quality" setting and the next session starts from it. Replays keep
+# the governor off: a fast --speed runs many steps per drawn frame.
+QUALITY_LEVELS = [
+    {"name": "low", "stars": 100, "particles": 150, "voices": 1, "hud_interval": 6},
+    {"name": "medium", "stars": 200, "particles": 300, "voices": 2, "hud_interval": 3},
+    {"name": "high", "stars": STAR_COUNT, "particles": MAX_PARTICLES, "voices": 3, "hud_interval": 1},
+]
 
 # Player class
 class Player(pygame.sprite.Sprite):
-    def __init__(self):
+    def __init__(self, game):
         super().__init__()
-        self.image = load_image('player.png', fallback_color=BLUE)
+        self.game = game
+        self.image = game.load_image('player.png', fallback_color=BLUE)
+        self.mask = game.load_mask('player.png', fallback_color=BLUE)
         self.rect = self.image.get_rect(center=(WIDTH // 2, HEIGHT - 50))
         self.speed = 8
         self.health = 5
-        self.last_shot = pygame.time.get_ticks()
+        self.last_shot = game.game_clock.ticks()
         self.shoot_delay = 250
         self.shoot_power = 1
         self.bullet_spread = 0
@@ -97,19 +149,19 @@ class Player(pygame.sprite.Sprite):
 
     def update(self):
         # Movement controls
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] and self.rect.left > 0:
+        controls = self.game.input_source.poll(self, self.game.enemies)
+        if controls.left and self.rect.left > 0:
             self.rect.x -= self.speed
-        if keys[pygame.K_RIGHT] and self.rect.right < WIDTH:
+        if controls.right and self.rect.right < WIDTH:
             self.rect.x += self.speed
-        if keys[pygame.K_UP] and self.rect.top > 0:
+        if controls.up and self.rect.top > 0:
             self.rect.y -= self.speed
-        if keys[pygame.K_DOWN] and self.rect.bottom < HEIGHT:
+        if controls.down and self.rect.bottom < HEIGHT:
             self.rect.y += self.speed
 
         # Shooting
-        if keys[pygame.K_SPACE]:
-            now = pygame.time.get_ticks()
+        if controls.fire:
+            now = self.game.game_clock.ticks()
             if now - self.last_shot > self.shoot_delay:
                 self.last_shot = now
                 self.shoot()
@@ -122,25 +174,20 @@ class Player(pygame.sprite.Sprite):
 
     def shoot(self):
         # Shoot single or multiple bullets depending on power level
+        projectiles = self.game.projectiles
         if self.shoot_power == 1:
-            bullet = Bullet(self.rect.centerx, self.rect.top)
-            all_sprites.add(bullet)
-            bullets.add(bullet)
+            projectiles.spawn(self.rect.centerx, self.rect.top, 0, BULLET_SPEED, PLAYER)
         else:
             spread_step = self.bullet_spread / (self.shoot_power - 1)
             start_angle = -self.bullet_spread / 2
             for i in range(self.shoot_power):
                 angle = start_angle + i * spread_step
-                bullet = Bullet(self.rect.centerx, self.rect.top)
-                bullet.speedx = math.sin(math.radians(angle)) * 5
-                all_sprites.add(bullet)
-                bullets.add(bullet)
-        if shoot_sound:
-            shoot_sound.play()
+                speedx = math.sin(math.radians(angle)) * 5
+                projectiles.spawn(self.rect.centerx, self.rect.top, speedx, BULLET_SPEED, PLAYER)
+        self.game.audio.play("shoot")
 
     def apply_powerup(self, powerup_type):
-        if powerup_sound:
-            powerup_sound.play()
+        self.game.audio.play("powerup")
         if powerup_type == 'MULTI_SHOT':
             self.shoot_power = min(self.shoot_power + 1, 5)
             self.bullet_spread = 30
@@ -150,44 +197,21 @@ class Player(pygame.sprite.Sprite):
             self.shield_active = True
             self.shield_time = 300
 
-# Player bullet class
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = load_image('bullet.png', fallback_color=WHITE, size=(5, 15))
-        self.rect = self.image.get_rect(center=(x, y))
-        self.speedy = -10
-        self.speedx = 0
-
-    def update(self):
-        self.rect.y += self.speedy
-        self.rect.x += self.speedx
-        if self.rect.bottom < 0:
-            self.kill()
-
-# Bullet fired by enemies
-class EnemyBullet(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface((5, 10))
-        self.image.fill(RED)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.speedy = 5
-
-    def update(self):
-        self.rect.y += self.speedy
-        if self.rect.top > HEIGHT:
-            self.kill()
-
 # Enemy class
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self):
+class Enemy(PooledSprite):
+    def __init__(self, game):
         super().__init__()
-        self.image = load_image('enemy.png', fallback_color=RED, size=(40, 30))
-        self.rect = self.image.get_rect(x=random.randint(0, WIDTH - 40), y=random.randint(-100, -40))
+        self.game = game
+        self.image = game.load_image('enemy.png', fallback_color=RED, size=(40, 30))
+        self.mask = game.load_mask('enemy.png', fallback_color=RED, size=(40, 30))
+        self.rect = self.image.get_rect()
+        self.reset()
+
+    def reset(self):
+        self.rect.topleft = (random.randint(0, WIDTH - 40), random.randint(-100, -40))
         self.speedy = random.randint(2, 4)
-        self.last_shot = pygame.time.get_ticks()
-        self.shoot_delay = random.randint(1500, 3000)
+        self.last_shot = self.game.game_clock.ticks()
+        self.shoot_delay = random.randint(*ENEMY_SHOOT_DELAY)
 
     def update(self):
         self.rect.y += self.speedy
@@ -195,24 +219,31 @@ class Enemy(pygame.sprite.Sprite):
             self.rect.y = random.randint(-100, -40)
             self.rect.x = random.randint(0, WIDTH - self.rect.width)
 
-        now = pygame.time.get_ticks()
+        now = self.game.game_clock.ticks()
         if now - self.last_shot > self.shoot_delay:
             self.last_shot = now
-            bullet = EnemyBullet(self.rect.centerx, self.rect.bottom)
-            all_sprites.add(bullet)
-            enemy_bullets.add(bullet)
-            if enemy_shoot_sound:
-                enemy_shoot_sound.play()
+            self.game.projectiles.spawn(self.rect.centerx, self.rect.bottom, 0, ENEMY_BULLET_SPEED, ENEMY)
+            self.game.audio.play("enemy_shoot")
 
 # Power-up class with random type
-class PowerUp(pygame.sprite.Sprite):
+class PowerUp(PooledSprite):
+    # One shared 20x20 swatch per power-up type
+    images = {}
+
     def __init__(self):
         super().__init__()
+        self.rect = pygame.Rect(0, 0, 20, 20)
+        self.reset()
+
+    def reset(self):
         self.type = random.choice(['MULTI_SHOT', 'SPEED_BOOST', 'SHIELD'])
         self.color = PURPLE if self.type == 'MULTI_SHOT' else ORANGE if self.type == 'SPEED_BOOST' else CYAN
-        self.image = pygame.Surface((20, 20))
-        self.image.fill(self.color)
-        self.rect = self.image.get_rect(x=random.randint(0, WIDTH - 20), y=random.randint(-100, -40))
+        self.image = PowerUp.images.get(self.type)
+        if self.image is None:
+            self.image = pygame.Surface((20, 20))
+            self.image.fill(self.color)
+            PowerUp.images[self.type] = self.image
+        self.rect.topleft = (random.randint(0, WIDTH - 20), random.randint(-100, -40))
         self.speedy = 3
 
     def update(self):
@@ -220,316 +251,762 @@ class PowerUp(pygame.sprite.Sprite):
         if self.rect.top > HEIGHT:
             self.kill()
 
-# Sprite groups
-all_sprites = pygame.sprite.Group()
-player = Player()
-all_sprites.add(player)
-
-bullets = pygame.sprite.Group()
-enemies = pygame.sprite.Group()
-powerups = pygame.sprite.Group()
-enemy_bullets = pygame.sprite.Group()
-
-# Load high score from file
-record_path = "record.txt"
-if os.path.exists(record_path):
-    with open(record_path, 'r') as f:
-        record = int(f.read())
-else:
-    record = 0
-
-# Game variables
-running = True
-score = 0
-level = 1
-font = pygame.font.Font(None, 36)
-start_time = time.time()
-kills = 0
-
-def show_start_screen(screen, game_data):
-    screen.fill((0, 0, 30))  # Dark background
-    
-    # Load fonts
-    title_font = pygame.font.Font(None, 74)
-    text_font = pygame.font.Font(None, 36)
-    
-    # Game Title
-    title_text = title_font.render("SPACE SHOOTER", True, CYAN)
-    screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 100))
-    
-    # High Scores
-    high_scores = game_data.get_high_scores()
-    high_score_text = text_font.render("High Scores:", True, WHITE)
-    screen.blit(high_score_text, (WIDTH//2 - high_score_text.get_width()//2, 200))
-    
-    for i, score_data in enumerate(high_scores[:3]):  # Show top 3 scores
-        score_line = text_font.render(
-            f"{i+1}. {score_data['score']} (Level {score_data['level']})", 
-            True, 
-            WHITE
-        )
-        screen.blit(score_line, (WIDTH//2 - score_line.get_width()//2, 250 + i*30))
-    
-    # Controls
-    controls = [
-        "Controls:",
-        "Arrow Keys - Move",
-        "Space - Shoot",
-        "Collect Power-ups:",
-        "Purple - Multi Shot",
-        "Orange - Speed Boost",
-        "Cyan - Shield"
-    ]
-    
-    for i, text in enumerate(controls):
-        control_text = text_font.render(text, True, WHITE)
-        screen.blit(control_text, (WIDTH//2 - control_text.get_width()//2, 350 + i*30))
-    
-    # Start instructions
-    start_text = text_font.render("Press SPACE to Start", True, WHITE)
-    screen.blit(start_text, (WIDTH//2 - start_text.get_width()//2, HEIGHT - 100))
-    
-    # Version
-    version_text = text_font.render("v1.0", True, WHITE)
-    screen.blit(version_text, (WIDTH - 60, HEIGHT - 30))
-    
-    pygame.display.flip()
-    
-    # Wait for player input
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_SPACE:
-                    return True
-                if event.key == pygame.K_ESCAPE:
-                    return False
-    return False
-
-def show_game_over_screen(screen, score, level, game_data):
-    # Create a semi-transparent overlay
-    overlay = pygame.Surface((WIDTH, HEIGHT))
-    overlay.fill((0, 0, 0))
-    overlay.set_alpha(128)
-    screen.blit(overlay, (0, 0))
-    
-    # Load fonts
-    title_font = pygame.font.Font(None, 74)
-    text_font = pygame.font.Font(None, 36)
-    small_font = pygame.font.Font(None, 24)
-    
-    # Game Over text with animation
-    game_over_text = title_font.render("GAME OVER", True, RED)
-    text_rect = game_over_text.get_rect(center=(WIDTH//2, 50))
-    
-    # Animate the text
-    for i in range(10):
-        screen.blit(overlay, (0, 0))  # Refresh overlay
+# Idle screens. The main loop draws one while no game is being played;
+# draw(now) draws whatever changed since the last call and returns how many
+# ms until the next change (None once nothing animates), so the loop can
+# sleep on the event queue in between. handle(event) returns "start",
+# "quit" or None.
+class TitleScreen:
+    def __init__(self, game):
+        self.game = game
+        self.drawn = False
+        self.scores_shown = False
+
+    def draw(self, now):
+        game = self.game
+        screen = game.screen
+        # Shared fonts; rendered text is cached across screens
+        title_font = game.text_cache.font(74)
+        text_font = game.text_cache.font(36)
+        if not self.drawn:
+            self.drawn = True
+            screen.fill((0, 0, 30))  # Dark background
+
+            # Game Title
+            title_text = title_font.render("SPACE SHOOTER", True, CYAN)
+            screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 100))
+
+            # High Scores come in once the game data has loaded
+            if not game.loader.done("game_data"):
+                loading_text = text_font.render("Loading...", True, WHITE)
+                screen.blit(loading_text, (WIDTH//2 - loading_text.get_width()//2, 200))
+
+            # Controls
+            controls = [
+                "Controls:",
+                "Arrow Keys - Move",
+                "Space - Shoot",
+                "Collect Power-ups:",
+                "Purple - Multi Shot",
+                "Orange - Speed Boost",
+                "Cyan - Shield"
+            ]
+
+            for i, text in enumerate(controls):
+                control_text = text_font.render(text, True, WHITE)
+                screen.blit(control_text, (WIDTH//2 - control_text.get_width()//2, 350 + i*30))
+
+            # Start instructions
+            start_text = text_font.render("Press SPACE to Start", True, WHITE)
+            screen.blit(start_text, (WIDTH//2 - start_text.get_width()//2, HEIGHT - 100))
+
+            # Version
+            version_text = text_font.render("v1.0", True, WHITE)
+            screen.blit(version_text, (WIDTH - 60, HEIGHT - 30))
+            self.draw_high_scores()
+            pygame.display.flip()
+            game.startup.setdefault("title", time.perf_counter() - STARTUP_BEGIN)
+        elif self.draw_high_scores():
+            pygame.display.flip()
+        # Check on the loader now and then until the scores are up
+        return None if self.scores_shown else 50
+
+    def draw_high_scores(self):
+        game = self.game
+        if self.scores_shown or not game.loader.done("game_data"):
+            return False
+        self.scores_shown = True
+        game.loader.wait("game_data")
+        screen = game.screen
+        text_font = game.text_cache.font(36)
+        screen.fill((0, 0, 30), (0, 195, WIDTH, 140))
+        high_score_text = text_font.render("High Scores:", True, WHITE)
+        screen.blit(high_score_text, (WIDTH//2 - high_score_text.get_width()//2, 200))
+
+        for i, score_data in enumerate(game.game_data.get_high_scores()[:3]):  # Show top 3 scores
+            score_line = text_font.render(
+                f"{i+1}. {score_data['score']} (Level {score_data['level']})",
+                True,
+                WHITE
+            )
+            screen.blit(score_line, (WIDTH//2 - score_line.get_width()//2, 250 + i*30))
+        return True
+
+    def handle(self, event):
+        if event.type == pygame.QUIT:
+            return "quit"
+        if event.type == pygame.KEYUP:
+            if event.key == pygame.K_SPACE:
+                return "start"
+            if event.key == pygame.K_ESCAPE:
+                return "quit"
+        return None
+
+# Game over: the title bounces, the results appear and the prompt blinks
+# three times, on a timeline of (ms, step) pairs run as their time comes.
+# Any key skips straight to the end; SPACE or ESC pressed on this screen
+# then restarts or quits, so letting go of the fire key does neither.
+class GameOverScreen:
+    BOUNCE_FRAMES = 10
+    BOUNCE_MS = 50
+    BLINKS = 3
+    BLINK_MS = 500
+
+    def __init__(self, game, now):
+        self.game = game
+        self.start = now
+        self.pressed = set()
+        self.skipped = False
+
+        # Create a semi-transparent overlay
+        self.overlay = pygame.Surface((WIDTH, HEIGHT))
+        self.overlay.fill((0, 0, 0))
+        self.overlay.set_alpha(128)
+
+        timeline = [(i * self.BOUNCE_MS, partial(self.bounce, i)) for i in range(self.BOUNCE_FRAMES)]
+        t = self.BOUNCE_FRAMES * self.BOUNCE_MS
+        timeline.append((t, self.results))
+        for i in range(self.BLINKS):
+            timeline.append((t + 2 * i * self.BLINK_MS, self.prompt))
+            timeline.append((t + (2 * i + 1) * self.BLINK_MS, self.dim))
+        timeline.append((t + 2 * self.BLINKS * self.BLINK_MS, self.prompt))
+        self.timeline = timeline
+        self.next_step = 0
+
+    @property
+    def animating(self):
+        return self.next_step < len(self.timeline)
+
+    def draw(self, now):
+        elapsed = math.inf if self.skipped else now - self.start
+        changed = False
+        while self.animating and self.timeline[self.next_step][0] <= elapsed:
+            self.timeline[self.next_step][1]()
+            self.next_step += 1
+            changed = True
+        if changed:
+            pygame.display.flip()
+        if not self.animating:
+            return None
+        return self.start + self.timeline[self.next_step][0] - now
+
+    def skip(self):
+        # Run everything left on the next draw
+        self.skipped = True
+
+    def bounce(self, i):
+        # Game Over text, oscillating
+        screen = self.game.screen
+        game_over_text = self.game.text_cache.font(74).render("GAME OVER", True, RED)
+        text_rect = game_over_text.get_rect(center=(WIDTH//2, 50))
+        screen.blit(self.overlay, (0, 0))  # Refresh overlay
         offset = math.sin(i * 0.5) * 5  # Oscillating offset
         screen.blit(game_over_text, (text_rect.x, text_rect.y + offset))
-        pygame.display.flip()
-        pygame.time.delay(50)
-    
-    # Final score with larger font
-    score_font = pygame.font.Font(None, 48)
-    score_text = score_font.render(f"Final Score: {score}", True, WHITE)
-    screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, 150))
-    
-    # Level reached
-    level_text = text_font.render(f"Level Reached: {level}", True, WHITE)
-    screen.blit(level_text, (WIDTH//2 - level_text.get_width()//2, 200))
-    
-    # High Scores with decorative line
-    pygame.draw.line(screen, WHITE, (WIDTH//4, 250), (3*WIDTH//4, 250), 2)
-    high_score_text = text_font.render("High Scores:", True, WHITE)
-    screen.blit(high_score_text, (WIDTH//2 - high_score_text.get_width()//2, 270))
-    
-    high_scores = game_data.get_high_scores()
-    for i, score_data in enumerate(high_scores[:5]):  # Show top 5 scores
-        # Highlight current score if it's in top 5
-        color = CYAN if score_data['score'] == score else WHITE
-        score_line = text_font.render(
-            f"{i+1}. {score_data['score']} (Level {score_data['level']}) - {score_data['date']}", 
-            True, 
-            color
-        )
-        screen.blit(score_line, (WIDTH//2 - score_line.get_width()//2, 320 + i*30))
-    
-    # Stats with icons
-    stats = game_data.get_stats()
-    stats_text = text_font.render("Game Statistics:", True, WHITE)
-    screen.blit(stats_text, (WIDTH//2 - stats_text.get_width()//2, 500))
-    
-    # Format play time
-    play_time = stats["total_play_time"]
-    hours = int(play_time // 3600)
-    minutes = int((play_time % 3600) // 60)
-    seconds = int(play_time % 60)
-    time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-    
-    # Draw stats with decorative elements
-    pygame.draw.line(screen, WHITE, (WIDTH//4, 530), (3*WIDTH//4, 530), 1)
-    time_text = text_font.render(f"⏱️  Total Play Time: {time_str}", True, WHITE)
-    screen.blit(time_text, (WIDTH//2 - time_text.get_width()//2, 540))
-    
-    kills_text = text_font.render(f"💀 Total Kills: {stats['total_kills']}", True, WHITE)
-    screen.blit(kills_text, (WIDTH//2 - kills_text.get_width()//2, 580))
-    
-    # Power-up stats
-    powerup_text = text_font.render("Power-ups Collected:", True, WHITE)
-    screen.blit(powerup_text, (WIDTH//2 - powerup_text.get_width()//2, 620))
-    
-    y_offset = 650
-    for powerup, count in stats['powerups_collected'].items():
-        color = PURPLE if powerup == 'MULTI_SHOT' else ORANGE if powerup == 'SPEED_BOOST' else CYAN
-        powerup_stat = small_font.render(f"{powerup}: {count}", True, color)
-        screen.blit(powerup_stat, (WIDTH//2 - powerup_stat.get_width()//2, y_offset))
-        y_offset += 25
-    
-    # Restart instructions with animation
-    for i in range(3):  # Blink the text 3 times
-        restart_text = text_font.render("Press SPACE to restart or ESC to quit", True, WHITE)
-        screen.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT - 50))
-        pygame.display.flip()
-        pygame.time.delay(500)
-        
-        screen.blit(overlay, (0, 0))  # Refresh overlay
-        pygame.display.flip()
-        pygame.time.delay(500)
-    
-    # Final display of instructions
-    restart_text = text_font.render("Press SPACE to restart or ESC to quit", True, WHITE)
-    screen.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT - 50))
-    pygame.display.flip()
-    
-    # Wait for player input
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_SPACE:
-                    return True
-                if event.key == pygame.K_ESCAPE:
-                    return False
-    return False
-
-# Main game loop
-while running:
-    # Show start screen
-    if not show_start_screen(screen, game_data):
-        running = False
-        break
-    
-    # Reset game state
-    all_sprites = pygame.sprite.Group()
-    player = Player()
-    all_sprites.add(player)
-    bullets = pygame.sprite.Group()
-    enemies = pygame.sprite.Group()
-    powerups = pygame.sprite.Group()
-    enemy_bullets = pygame.sprite.Group()
-    score = 0
-    level = 1
-    kills = 0
-    start_time = time.time()
-    
-    # Spawn initial enemies
-    for _ in range(6):
-        e = Enemy()
-        all_sprites.add(e)
-        enemies.add(e)
-    
-    # Game loop
-    game_running = True
-    while game_running:
-        clock.tick(FPS)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                game_running = False
-
-        all_sprites.update()
-        for star in stars:
-            star.update()
-
-        # Bullet-enemy collision
-        hits = pygame.sprite.groupcollide(enemies, bullets, True, True)
-        for _ in hits:
-            score += 10
-            kills += 1
-            e = Enemy()
-            all_sprites.add(e)
-            enemies.add(e)
-            if random.random() < 0.2:
-                p = PowerUp()
-                all_sprites.add(p)
-                powerups.add(p)
+
+    def results(self):
+        game = self.game
+        screen = game.screen
+        score = game.score
+        game_data = game.game_data
+        # Shared fonts; rendered text is cached across screens
+        text_font = game.text_cache.font(36)
+        small_font = game.text_cache.font(24)
+
+        # Final score with larger font
+        score_font = game.text_cache.font(48)
+        score_text = score_font.render(f"Final Score: {score}", True, WHITE)
+        screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, 150))
+
+        # Level reached
+        level_text = text_font.render(f"Level Reached: {game.level}", True, WHITE)
+        screen.blit(level_text, (WIDTH//2 - level_text.get_width()//2, 200))
+
+        # High Scores with decorative line
+        pygame.draw.line(screen, WHITE, (WIDTH//4, 250), (3*WIDTH//4, 250), 2)
+        high_score_text = text_font.render("High Scores:", True, WHITE)
+        screen.blit(high_score_text, (WIDTH//2 - high_score_text.get_width()//2, 270))
+
+        high_scores = game_data.get_high_scores()
+        for i, score_data in enumerate(high_scores[:5]):  # Show top 5 scores
+            # Highlight current score if it's in top 5
+            color = CYAN if score_data['score'] == score else WHITE
+            score_line = text_font.render(
+                f"{i+1}. {score_data['score']} (Level {score_data['level']}) - {score_data['date']}",
+                True,
+                color
+            )
+            screen.blit(score_line, (WIDTH//2 - score_line.get_width()//2, 320 + i*30))
+
+        # Stats with icons
+        stats = game_data.get_stats()
+        stats_text = text_font.render("Game Statistics:", True, WHITE)
+        screen.blit(stats_text, (WIDTH//2 - stats_text.get_width()//2, 500))
+
+        # Format play time
+        play_time = stats["total_play_time"]
+        hours = int(play_time // 3600)
+        minutes = int((play_time % 3600) // 60)
+        seconds = int(play_time % 60)
+        time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+        # Draw stats with decorative elements
+        pygame.draw.line(screen, WHITE, (WIDTH//4, 530), (3*WIDTH//4, 530), 1)
+        time_text = text_font.render(f"⏱️  Total Play Time: {time_str}", True, WHITE)
+        screen.blit(time_text, (WIDTH//2 - time_text.get_width()//2, 540))
+
+        kills_text = text_font.render(f"💀 Total Kills: {stats['total_kills']}", True, WHITE)
+        screen.blit(kills_text, (WIDTH//2 - kills_text.get_width()//2, 580))
+
+        # Power-up stats
+        powerup_text = text_font.render("Power-ups Collected:", True, WHITE)
+        screen.blit(powerup_text, (WIDTH//2 - powerup_text.get_width()//2, 620))
+
+        y_offset = 650
+        for powerup, count in stats['powerups_collected'].items():
+            color = PURPLE if powerup == 'MULTI_SHOT' else ORANGE if powerup == 'SPEED_BOOST' else CYAN
+            powerup_stat = small_font.render(f"{powerup}: {count}", True, color)
+            screen.blit(powerup_stat, (WIDTH//2 - powerup_stat.get_width()//2, y_offset))
+            y_offset += 25
+
+    def prompt(self):
+        # Restart instructions, blinking until the last step leaves them up
+        restart_text = self.game.text_cache.font(36).render("Press SPACE to restart or ESC to quit", True, WHITE)
+        self.game.screen.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT - 50))
+
+    def dim(self):
+        self.game.screen.blit(self.overlay, (0, 0))  # Refresh overlay
+
+    def handle(self, event):
+        if event.type == pygame.QUIT:
+            return "quit"
+        if event.type == pygame.KEYDOWN:
+            # A press during the animation only skips it; its release does nothing
+            if self.animating:
+                self.skip()
+            else:
+                self.pressed.add(event.key)
+        elif event.type == pygame.KEYUP and event.key in self.pressed:
+            if event.key == pygame.K_SPACE:
+                return "start"
+            if event.key == pygame.K_ESCAPE:
+                return "quit"
+        return None
+
+# The whole game: window, loaded assets, game state and the main loop.
+# The constructor only does what the title screen needs (display, fonts,
+# clock, input). Game data, sounds and images load on a background thread
+# while the title screen is up; finish_loading() joins it and builds the
+# objects that need them. Headless runs load everything up front.
+class Game:
+    def __init__(self, args):
+        self.args = args
+        self.headless = args.headless
+        if self.headless:
+            # SDL dummy drivers must be selected before pygame initializes
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        self.startup = {}
+
+        # Only the display and fonts are initialized here; audio starts in the loader
+        pygame.display.init()
+        pygame.font.init()
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Space Shooter")
+        # Headless mode steps frames back to back with simulated time instead of sleeping
+        self.game_clock = GameClock(FPS, realtime=not self.headless, render_fps=RENDER_FPS, speed=args.speed)
+
+        # Where the player's controls come from: keyboard, scripted file or bot
+        # A replay feeds back recorded inputs instead, and a recorder wraps whichever source is used
+        self.replay = Recording.load(args.replay) if args.replay else None
+        if self.replay:
+            self.input_source = ReplayInput(self.replay)
+        else:
+            self.input_source = make_input(args.input or ("bot" if self.headless else "keyboard"), args.script, HEIGHT)
+            if args.record:
+                self.input_source = RecordingInput(self.input_source)
+        # Replays and headless runs skip the start and game over screens
+        self.autoplay = self.headless or self.replay is not None
+
+        # Fonts and text shared by the menus, and the change-driven in-game HUD
+        self.text_cache = TextCache()
+        self.stars = Starfield(WIDTH, HEIGHT, count=STAR_COUNT, layers=3)
+        self.profiler = FrameProfiler(PROFILE_PHASES, window=300, enabled=args.profile, record=bool(args.profile_csv))
+        self.profiler_overlay = ProfilerOverlay(self.profiler, self.text_cache, WIDTH, budget_ms=1000 / FPS)
+
+        # Images are loaded, scaled and converted once and then shared through the cache.
+        # If an image is not found, a colored rectangle fallback is used
+        self.asset_cache = AssetCache('assets')
+        self.game_data = None
+        self.settings = None
+        self.audio = None
+        self.loaded = False
+
+        self.loader = BackgroundLoader()
+        self.loader.add("game_data", self._load_game_data)
+        self.loader.add("sounds", self._load_sounds)
+        self.loader.add("images", self._load_images)
+
+        # Game variables
+        self.running = True
+        self.score = 0
+        self.level = 1
+        self.start_time = 0
+        self.kills = 0
+        self.session_powerups = {}
+        self.games_played = 0
+        self.games_started = 0
+        self.recording = bool(args.record) and self.replay is None
+        self.menu = None
+        self.all_sprites = pygame.sprite.Group()
+
+        if self.headless:
+            self.finish_loading()
+        else:
+            self.loader.start()
+
+    def load_image(self, name, fallback_color=(255, 255, 255), size=(50, 40)):
+        return self.asset_cache.load_image(name, fallback_color, size)
+
+    def load_mask(self, name, fallback_color=(255, 255, 255), size=(50, 40)):
+        return self.asset_cache.load_mask(name, fallback_color, size)
+
+    # Background loader tasks
+
+    def _load_game_data(self):
+        if self.headless or self.replay:
+            self.game_data = GameData(storage=MemoryStorage())
+        else:
+            self.game_data = GameData(write_behind=True, flush_interval=5.0, storage=STORAGE_BACKEND)
+        self.settings = self.game_data.get_settings()
+
+        # Load high score from file
+        record_path = "record.txt"
+        if os.path.exists(record_path):
+            with open(record_path, 'r') as f:
+                self.record = int(f.read())
+        else:
+            self.record = 0
+
+    def _load_sounds(self):
+        try:
+            mixer.init()
+        except pygame.error as e:
+            # No audio device: play on in silence
+            print(f"Warning: sound disabled ({e})")
+        self.audio = AudioManager(SOUND_CHANNELS, volume=self.settings["sound_volume"])
+        try:
+            if self.audio.enabled:
+                sound_bank = SoundBank(cache_dir=".sound_cache")
+                self.audio.add("shoot", sound_bank.variants("shoot", SHOT_PITCHES), "player", max_voices=2)
+                self.audio.add("powerup", sound_bank.get("powerup"), "powerup", max_voices=1)
+                self.audio.add("enemy_shoot", sound_bank.variants("enemy_shoot", SHOT_PITCHES), "enemy", max_voices=3)
+        except Exception:
+            try:
+                self.audio.load("shoot", 'sounds/shoot.wav', "player", max_voices=2)
+                self.audio.load("powerup", 'sounds/powerup.wav', "powerup", max_voices=1)
+                self.audio.load("enemy_shoot", 'sounds/enemy_shoot.wav', "enemy", max_voices=3)
+            except:
+                print("Warning: Sounds not loaded correctly.")
+
+    def _load_images(self):
+        stale_assets = check_manifest()
+        if stale_assets:
+            print(f"Warning: assets out of date ({', '.join(stale_assets)}); run python build_assets.py")
+        self.asset_cache.load_atlas('atlas.json')
+        self.asset_cache.preload(PRELOAD_IMAGES)
+        self.background_img = self.load_image('background.jpg', fallback_color=(0, 0, 30), size=(WIDTH, HEIGHT))
+
+    def finish_loading(self):
+        # Wait for the loader, then build everything that needed its results
+        if self.loaded:
+            return
+        self.loader.wait()
+        self.loaded = True
+
+        # Full-screen flip or dirty-rect updates, picked by the "render_mode" setting
+        self.renderer = Renderer(self.screen, self.background_img, self.settings["render_mode"])
+
+        # Player and enemy bullets live in one structure-of-arrays projectile engine
+        self.projectiles = ProjectileSystem(WIDTH, HEIGHT, {
+            PLAYER: self.load_image('bullet.png', fallback_color=WHITE, size=(5, 15)),
+            ENEMY: self.load_image('enemy_bullet.png', fallback_color=RED, size=(5, 10)),
+        }, capacity=PROJECTILE_CAPACITY, masks={
+            PLAYER: self.load_mask('bullet.png', fallback_color=WHITE, size=(5, 15)),
+            ENEMY: self.load_mask('enemy_bullet.png', fallback_color=RED, size=(5, 10)),
+        } if PIXEL_COLLISIONS else None)
+        self.particles = ParticleSystem(WIDTH, HEIGHT, self.load_image('firework.png', fallback_color=ORANGE, size=(32, 32)),
+                                        capacity=MAX_PARTICLES)
+
+        # Sprite pools, re-bound to the groups whenever they are rebuilt
+        self.enemy_pool = SpritePool(partial(Enemy, self), ENEMY_POOL_SIZE)
+        self.powerup_pool = SpritePool(PowerUp, POWERUP_POOL_SIZE)
+        self.enemy_pool.prefill(16)
+
+        self.hud = Hud(self.text_cache, pos=(10, 10), size=36, color=WHITE)
+        self.hud.add_field("score", "Score: {}")
+        self.hud.add_field("level", "Level: {}")
+        self.hud.add_field("health", "Health: {}")
+        self.hud.add_field("high_score", "High Score: {}")
+        self.quality_hud = Hud(self.text_cache, pos=(10, HEIGHT - 26), size=24, color=WHITE)
+        self.quality_hud.add_field("quality", "Quality: {}")
+
+        names = [level["name"] for level in QUALITY_LEVELS]
+        saved = self.settings["quality"]
+        self.quality = QualityGovernor(QUALITY_LEVELS, 1000 / FPS,
+                                       level=names.index(saved) if saved in names else None,
+                                       enabled=self.settings["auto_quality"] and not self.headless and not self.replay)
+        self.apply_quality()
+
+        self.startup["loaded"] = time.perf_counter() - STARTUP_BEGIN
+        self.startup.update({f"{name}_task": seconds for name, seconds in self.loader.timings.items()})
+
+    def startup_report(self):
+        parts = []
+        if "title" in self.startup:
+            parts.append(f"title screen after {self.startup['title'] * 1000:.0f} ms")
+        parts.append(f"everything loaded after {self.startup['loaded'] * 1000:.0f} ms")
+        tasks = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.loader.timings.items())
+        return f"Startup: {', '.join(parts)} (loader: {tasks})"
+
+    def apply_quality(self):
+        quality = self.quality.settings
+        self.stars.set_count(quality["stars"])
+        self.particles.set_capacity(quality["particles"])
+        self.audio.set_voice_limit(quality["voices"])
+        self.quality_hud.set("quality", quality["name"])
+        self.hud_countdown = 0
+
+    def bind_pools(self):
+        self.enemy_pool.set_groups(self.all_sprites, self.enemies)
+        self.powerup_pool.set_groups(self.all_sprites, self.powerups)
+
+    # Reset game state, returning the previous game's sprites to their pools.
+    # Seeding every random source and restarting game time here makes a game
+    # depend only on its seed and the inputs polled each step.
+    def new_game(self, seed):
+        random.seed(seed)
+        self.stars.reseed(seed)
+        self.particles.reseed(seed)
+        self.game_clock.reset_game_time()
+        for sprite in self.all_sprites.sprites():
+            sprite.kill()
+        self.all_sprites = pygame.sprite.Group()
+        self.player = Player(self)
+        self.all_sprites.add(self.player)
+        self.enemies = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+        self.bind_pools()
+        self.projectiles.clear()
+        self.particles.clear()
+        self.score = 0
+        self.level = 1
+        self.kills = 0
+        self.session_powerups = {}
+        self.start_time = self.game_clock.seconds()
+        self.hud_countdown = 0
+
+        # The high score table only changes at game over
+        high_scores = self.game_data.get_high_scores()
+        self.hud.set("high_score", high_scores[0]['score'] if high_scores else 0)
+
+        # Spawn initial enemies
+        for _ in range(6):
+            self.enemy_pool.spawn()
+
+    # Frame phases. The game loop runs them in order; benchmark.py times them separately.
+    def update_phase(self):
+        remember_positions(self.all_sprites)
+        self.all_sprites.update()
+        self.projectiles.update()
+        self.particles.update()
+        self.stars.update()
+
+    def collision_phase(self):
+        # Resolves every collision of the frame and returns the damage the player took.
+        # Bullets go through the projectile engine's own broadphase; the player is a
+        # single sprite, so a plain rect scan of each group beats building a grid.
+        player = self.player
+
+        # Bullet-enemy collision, all player bullets against all enemies at once
+        hits = self.projectiles.collide_sprites(self.enemies, PLAYER)
+        for enemy in hits:
+            self.particles.burst(*enemy.rect.center, KILL_PARTICLES)
+            enemy.kill()
+            self.score += 10
+            self.kills += 1
+            self.enemy_pool.spawn()
+            if random.random() < POWERUP_DROP_CHANCE:
+                self.powerup_pool.spawn()
 
         # Player gets powerup
-        powerup_hits = pygame.sprite.spritecollide(player, powerups, True)
+        powerup_hits = pygame.sprite.spritecollide(player, self.powerups, True)
         for hit in powerup_hits:
             player.apply_powerup(hit.type)
-            game_data.update_stats(0, 0, hit.type)
-
-        # Enemy bullet hits player
-        if pygame.sprite.spritecollide(player, enemy_bullets, True):
-            if not player.shield_active:
-                player.health -= 1
-                if player.health <= 0:
-                    # Save game data
-                    play_time = time.time() - start_time
-                    game_data.update_stats(play_time, kills)
-                    game_data.add_high_score(score, level)
-                    
-                    # Show game over screen
-                    if not show_game_over_screen(screen, score, level, game_data):
-                        running = False
-                        game_running = False
-                    else:
-                        game_running = False
-
-        # Enemy collision with player
-        if pygame.sprite.spritecollide(player, enemies, True):
-            if not player.shield_active:
-                player.health -= 1
-                if player.health <= 0:
-                    # Save game data
-                    play_time = time.time() - start_time
-                    game_data.update_stats(play_time, kills)
-                    game_data.add_high_score(score, level)
-                    
-                    # Show game over screen
-                    if not show_game_over_screen(screen, score, level, game_data):
-                        running = False
-                        game_running = False
-                    else:
-                        game_running = False
-
+            self.game_data.update_stats(0, 0, hit.type)
+            self.session_powerups[hit.type] = self.session_powerups.get(hit.type, 0) + 1
+
+        # Enemy bullets and enemy collisions each cost one health point
+        damage = 0
+        if self.projectiles.collide_rect(player.rect, ENEMY, player.mask if PIXEL_COLLISIONS else None):
+            damage += 1
+        # Masks are only compared for enemies whose rects overlap the player's
+        crashed = pygame.sprite.spritecollide(player, self.enemies, False)
+        if PIXEL_COLLISIONS:
+            crashed = [enemy for enemy in crashed if pygame.sprite.collide_mask(player, enemy)]
+        for enemy in crashed:
+            enemy.kill()
+        if crashed:
+            damage += 1
+        return damage
+
+    def level_phase(self):
         # Level up logic
-        if score > level * 100:
-            level += 1
-            player.shoot_power = min(player.shoot_power * 2, 8)
-            player.bullet_spread = 30
-            for _ in range(2):
-                e = Enemy()
-                all_sprites.add(e)
-                enemies.add(e)
-
-        # Drawing
-        screen.blit(background_img, (0, 0))
-        for star in stars:
-            star.draw(screen)
-        all_sprites.draw(screen)
-        
-        # Display high scores
-        high_scores = game_data.get_high_scores()
-        high_score_text = f"High Score: {high_scores[0]['score'] if high_scores else 0}"
-        score_text = font.render(f"Score: {score}  Level: {level}  Health: {player.health}  {high_score_text}", True, WHITE)
-        screen.blit(score_text, (10, 10))
-        pygame.display.flip()
-
-pygame.quit()
+        if self.score > self.level * LEVEL_SCORE_STEP:
+            self.level += 1
+            self.player.shoot_power = min(self.player.shoot_power * 2, 8)
+            self.player.bullet_spread = 30
+            for _ in range(LEVEL_UP_ENEMIES):
+                self.enemy_pool.spawn()
+
+    def draw_phase(self, alpha=1.0):
+        # alpha: how far between the last two simulation steps to draw moving objects
+        screen = self.screen
+        renderer = self.renderer
+        renderer.begin_frame()
+        drawn = renderer.frame_rects()
+        self.stars.draw(screen, drawn, alpha)
+        sprite_rects = draw_interpolated(screen, self.all_sprites, alpha)
+        if drawn is not None:
+            for rect in sprite_rects:
+                renderer.add_rect(rect)
+        self.projectiles.draw(screen, drawn, alpha)
+        self.particles.draw(screen, drawn, alpha)
+
+        # Display score, level, health and high score; fields re-render only on change,
+        # and lower quality levels only look for changes every few frames
+        self.hud_countdown -= 1
+        if self.hud_countdown <= 0:
+            self.hud_countdown = self.quality.settings["hud_interval"]
+            self.hud.set("score", self.score)
+            self.hud.set("level", self.level)
+            self.hud.set("health", self.player.health)
+        for rect in self.hud.draw(screen):
+            renderer.add_rect(rect)
+        for rect in self.quality_hud.draw(screen):
+            renderer.add_rect(rect)
+        if self.profiler.requested:
+            renderer.add_rect(self.profiler_overlay.draw(screen))
+        self.profiler.mark("draw")
+        renderer.end_frame()
+        self.profiler.mark("flip")
+
+    def take_damage(self, damage):
+        # Health lost this step, unless the shield is up
+        if damage and not self.player.shield_active:
+            self.player.health -= damage
+            self.particles.burst(*self.player.rect.center, DAMAGE_PARTICLES * damage, speed=6.0)
+
+    def step_frame(self):
+        # One fixed simulation step; returns False once the player is out of health
+        profiler = self.profiler
+        self.update_phase()
+        profiler.mark("update")
+        self.take_damage(self.collision_phase())
+        profiler.mark("collision")
+        self.level_phase()
+        profiler.mark("level")
+        return self.player.health > 0
+
+    def end_game(self):
+        # Save the finished game's stats
+        play_time = self.game_clock.seconds() - self.start_time
+        self.game_data.update_stats(play_time, self.kills)
+        self.game_data.add_high_score(self.score, self.level, self.kills, play_time, self.session_powerups)
+        self.game_data.flush()
+        self.games_played += 1
+        self.profiler.mark("save")
+
+    def game_seed(self, game_index):
+        if self.replay:
+            return self.replay.seed
+        if self.args.seed is not None:
+            return (self.args.seed + game_index) % 2 ** 64
+        return random.SystemRandom().randrange(2 ** 63)
+
+    def recording_path(self, game_index):
+        if game_index == 0:
+            return self.args.record
+        base, ext = os.path.splitext(self.args.record)
+        return f"{base}-{game_index + 1}{ext}"
+
+    def simulate_game(self, seed, max_frames=0):
+        # One complete game with no drawing or saving, for batch runs
+        self.new_game(seed)
+        steps = 0
+        start = time.perf_counter()
+        alive = True
+        while alive and not (max_frames and steps >= max_frames):
+            self.game_clock.step()
+            steps += 1
+            alive = self.step_frame()
+        elapsed = time.perf_counter() - start
+        return {
+            "seed": seed,
+            "score": self.score,
+            "level": self.level,
+            "kills": self.kills,
+            "survival_time": self.game_clock.seconds(),
+            "frames": steps,
+            "frame_ms": elapsed * 1000 / max(steps, 1),
+            "died": self.player.health <= 0
+        }
+
+    # Main loop: one frame of the game being played, or of the idle screen on show
+    def run(self):
+        self.game_clock.start()
+        self.next_game()
+        while self.running:
+            if self.menu is None:
+                self.play_frame()
+            else:
+                self.menu_frame()
+        self.shutdown()
+
+    def next_game(self):
+        # Headless runs and replays go straight into the next game, or stop; players get the title screen
+        if not self.autoplay:
+            self.menu = TitleScreen(self)
+        elif self.games_played < (1 if self.replay else self.args.games):
+            self.finish_loading()
+            self.start_game()
+        else:
+            self.running = False
+
+    def start_game(self):
+        if self.games_started == 0:
+            print(self.startup_report())
+        self.menu = None
+        self.renderer.invalidate()
+        seed = self.game_seed(self.games_started)
+        if self.recording:
+            self.input_source.start(seed, FPS)
+        self.new_game(seed)
+        self.games_started += 1
+        self.game_clock.resume()
+        self.quality.reset()
+
+    def menu_frame(self):
+        # Idle screens draw only what changed and sleep on the event queue until
+        # the next input or animation step, instead of polling flat out
+        menu = self.menu
+        wake = menu.draw(pygame.time.get_ticks())
+        events = pygame.event.get()
+        if not events and wake != 0:
+            event = pygame.event.wait() if wake is None else pygame.event.wait(wake)
+            if event.type != pygame.NOEVENT:
+                events = [event]
+        for event in events:
+            action = menu.handle(event)
+            if action == "quit":
+                self.running = False
+                return
+            if action == "start":
+                if isinstance(menu, TitleScreen):
+                    # Loading is usually long done; if not, the game starts when it is
+                    self.finish_loading()
+                    self.start_game()
+                else:
+                    self.next_game()
+                return
+
+    def play_frame(self):
+        # Run the simulation steps that are due, then draw one frame
+        args = self.args
+        game_clock = self.game_clock
+        profiler = self.profiler
+        steps = game_clock.advance()
+        # Frame work starts once the clock stops waiting
+        work_start = time.perf_counter()
+        profiler.begin_frame()
+        self.audio.begin_frame()
+        playing = True
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+                playing = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle()
+                self.renderer.invalidate()
+        profiler.mark("events")
+
+        died = False
+        for _ in range(steps if playing else 0):
+            if (args.frames and game_clock.frames >= args.frames) or (self.replay and self.input_source.finished):
+                self.running = False
+                playing = False
+                break
+            game_clock.step()
+            if not self.step_frame():
+                playing = False
+                died = True
+                self.end_game()
+                break
+
+        # Drawing; headless runs skip it entirely
+        if playing and not self.headless:
+            self.draw_phase(game_clock.alpha())
+            if self.quality.record((time.perf_counter() - work_start) * 1000):
+                self.apply_quality()
+                self.game_data.update_settings({"quality": self.quality.settings["name"]})
+        profiler.end_frame()
+        if playing:
+            return
+
+        if self.recording:
+            self.input_source.recording.score = self.score
+            self.input_source.recording.save(self.recording_path(self.games_started - 1))
+        if self.replay:
+            result = "matches" if self.score == self.replay.score else f"differs from the recorded {self.replay.score}"
+            print(f"Replay: {self.input_source.step} steps, score {self.score} {result}")
+        if died:
+            if self.autoplay:
+                self.next_game()
+            else:
+                self.menu = GameOverScreen(self, pygame.time.get_ticks())
+
+    def shutdown(self):
+        # Write any stats still pending before exiting; the loader may still be busy
+        # if the player quit from the title screen
+        self.loader.wait()
+        self.game_data.close()
+
+        if self.headless:
+            sim_fps = self.game_clock.frames_per_second()
+            print(f"Headless: {self.game_clock.frames} frames in {self.game_clock.wall_seconds():.2f}s, "
+                  f"{sim_fps:.0f} simulated FPS ({sim_fps / FPS:.1f}x real time), {self.games_played} game(s) finished")
+
+        audio_stats = self.audio.stats()
+        if audio_stats["played"] or audio_stats["dropped_total"]:
+            dropped = ", ".join(f"{count} {reason.replace('_', ' ')}" for reason, count in audio_stats["dropped"].items() if count)
+            print(f"Audio: {audio_stats['played']} sounds played, {audio_stats['dropped_total']} dropped" + (f" ({dropped})" if dropped else ""))
+
+        if self.loaded:
+            render_stats = self.renderer.stats()
+            if render_stats["frames"]:
+                print(f"Render mode '{render_stats['mode']}': {render_stats['average_coverage']:.1%} of the screen updated per frame on average")
+                particle_stats = self.particles.stats()
+                if particle_stats["peak"]:
+                    print(f"Particles: peak {particle_stats['peak']} of {particle_stats['capacity']}, {particle_stats['dropped']} dropped at the cap")
+            quality_stats = self.quality.stats()
+            if quality_stats["steps_down"] or quality_stats["steps_up"]:
+                print(f"Quality: ended at '{self.quality.settings['name']}' after {quality_stats['steps_down']} step(s) down"
+                      f" and {quality_stats['steps_up']} up")
+
+        if self.args.profile_csv:
+            rows = self.profiler.write_csv(self.args.profile_csv)
+            print(f"Frame profile: {rows} frames written to {self.args.profile_csv}")
+
+        pygame.quit()
+
+if __name__ == "__main__":
+    Game(parse_args()).run()
@@ -0,0 +1,145 @@
+import numpy as np
+import pygame
+
+# Capped particle system for explosions, in the same structure-of-arrays
+# style as the projectile engine: live particles sit in slots [0, count) of
+# preallocated NumPy arrays, one vectorized step moves and ages them all,
+# and drawing is a single Surface.blits call.
+# The sprite is faded (and shrunk) ahead of time into a few variants, so a
+# particle's look is just an index picked from its remaining life. Bursts
+# past the cap are cut short rather than growing the arrays, which keeps
+# the frame cost bounded during mass kills.
+# Particles are cosmetic and draw from their own generator, never the
+# game's random module, so they do not change how a seeded game plays out.
+FADE_STEPS = 8
+DRAG = 0.94
+
+def faded_variants(image, steps=FADE_STEPS, start_size=24, end_size=8):
+    # Variant 0 is the full sprite at start_size; the last is end_size and nearly transparent
+    variants = []
+    for k in range(steps):
+        t = k / (steps - 1) if steps > 1 else 0.0
+        size = max(1, round(start_size + (end_size - start_size) * t))
+        variant = pygame.transform.smoothscale(image, (size, size))
+        if variant.get_flags() & pygame.SRCALPHA:
+            alpha = round(255 * (1 - t) ** 1.5)
+            variant.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        else:
+            variant.set_alpha(round(255 * (1 - t)))
+        variants.append(variant)
+    return variants
+
+class ParticleSystem:
+    def __init__(self, width, height, image, capacity=600, seed=None):
+        self.width = width
+        self.height = height
+        self.variants = faded_variants(image)
+        # Variant sizes, for centering and the dirty rects
+        self.sizes = np.array([v.get_size() for v in self.variants], dtype=np.int32)
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.px = np.zeros(capacity, dtype=np.float32)
+        self.py = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int16)
+        self.lifespan = np.ones(capacity, dtype=np.int16)
+        self.count = 0
+        self.peak = 0
+        self.dropped = 0
+        self.rng = np.random.default_rng(seed)
+
+    def reseed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    def clear(self):
+        self.count = 0
+
+    def set_capacity(self, capacity):
+        # Change the cap at run time, up to the size the arrays were allocated with.
+        # Particles past a lowered cap are dropped.
+        self.capacity = min(capacity, len(self.x))
+        self.count = min(self.count, self.capacity)
+
+    def burst(self, x, y, count, speed=4.0, life=(20, 40)):
+        # count particles flying out of (x, y) in random directions
+        k = min(count, self.capacity - self.count)
+        self.dropped += count - k
+        if k <= 0:
+            return
+        rng = self.rng
+        i = self.count
+        j = i + k
+        angle = rng.uniform(0, 2 * np.pi, k)
+        velocity = rng.uniform(0.3, 1.0, k) * speed
+        self.x[i:j] = x
+        self.y[i:j] = y
+        self.px[i:j] = x
+        self.py[i:j] = y
+        self.vx[i:j] = np.cos(angle) * velocity
+        self.vy[i:j] = np.sin(angle) * velocity
+        self.lifespan[i:j] = rng.integers(life[0], life[1] + 1, k)
+        self.life[i:j] = self.lifespan[i:j]
+        self.count = j
+        self.peak = max(self.peak, j)
+
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        self.px[:n] = x
+        self.py[:n] = y
+        x += self.vx[:n]
+        y += self.vy[:n]
+        self.vx[:n] *= DRAG
+        self.vy[:n] *= DRAG
+        self.life[:n] -= 1
+
+        # Drop expired particles, keeping the live ones packed at the front
+        keep = np.flatnonzero(self.life[:n] > 0)
+        if len(keep) < n:
+            k = len(keep)
+            for arr in (self.x, self.y, self.px, self.py, self.vx, self.vy, self.life, self.lifespan):
+                arr[:k] = arr[keep]
+            self.count = k
+
+    def draw(self, surface, rects=None, alpha=1.0):
+        # Same contract as ProjectileSystem.draw: optional dirty rects and interpolation
+        n = self.count
+        if not n:
+            return
+        if alpha < 1.0:
+            px = self.px[:n]
+            py = self.py[:n]
+            cx = px + (self.x[:n] - px) * alpha
+            cy = py + (self.y[:n] - py) * alpha
+        else:
+            cx = self.x[:n]
+            cy = self.y[:n]
+        age = 1 - self.life[:n] / self.lifespan[:n]
+        variant = np.minimum((age * len(self.variants)).astype(np.int32), len(self.variants) - 1)
+        size = self.sizes[variant]
+        xs = cx.astype(np.int32) - size[:, 0] // 2
+        ys = cy.astype(np.int32) - size[:, 1] // 2
+        variants = self.variants
+        surface.blits([(variants[v], (x, y)) for v, x, y in zip(variant.tolist(), xs.tolist(), ys.tolist())],
+                      doreturn=False)
+        if rects is not None:
+            left = np.clip(xs, 0, self.width)
+            top = np.clip(ys, 0, self.height)
+            right = np.clip(xs + size[:, 0], 0, self.width)
+            bottom = np.clip(ys + size[:, 1], 0, self.height)
+            visible = (right > left) & (bottom > top)
+            rects.extend(zip(left[visible].tolist(), top[visible].tolist(),
+                             (right - left)[visible].tolist(), (bottom - top)[visible].tolist()))
+
+    def stats(self):
+        return {
+            "live": self.count,
+            "peak": self.peak,
+            "capacity": self.capacity,
+            "dropped": self.dropped
+        }
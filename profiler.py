@@ -0,0 +1,126 @@
+import csv
+import time
+import numpy as np
+import pygame
+
+# Per-phase frame profiler.
+# The game loop calls begin_frame(), then mark(phase) right after each phase
+# finishes, then end_frame(). Each mark charges the time since the previous
+# mark to that phase. The last `window` frames are kept in a ring buffer for
+# the overlay; with recording on, every frame is also kept for a CSV dump.
+# While disabled every call returns immediately, so the hooks can stay in the loop.
+class FrameProfiler:
+    def __init__(self, phases, window=300, enabled=False, record=False):
+        self.phases = tuple(phases)
+        self.index = {phase: i for i, phase in enumerate(self.phases)}
+        self.window = window
+        self.samples = np.zeros((window, len(self.phases)), dtype=np.float64)
+        self.filled = 0
+        self.pos = 0
+        self.frames = 0
+        self.record = record
+        self.rows = []
+        self.current = [0.0] * len(self.phases)
+        self.last = 0.0
+        self.enabled = enabled or record
+        self.requested = self.enabled
+        self.in_frame = False
+
+    def toggle(self):
+        # Takes effect at the next begin_frame, so a frame is never half-timed
+        self.requested = not self.requested
+
+    def begin_frame(self):
+        self.enabled = self.requested or self.record
+        if not self.enabled:
+            return
+        self.current = [0.0] * len(self.phases)
+        self.in_frame = True
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        if not self.in_frame:
+            return
+        now = time.perf_counter()
+        self.current[self.index[phase]] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        if not self.in_frame:
+            return
+        self.in_frame = False
+        self.samples[self.pos] = self.current
+        self.pos = (self.pos + 1) % self.window
+        self.filled = min(self.filled + 1, self.window)
+        self.frames += 1
+        if self.record:
+            self.rows.append((self.frames, *self.current))
+
+    def summary(self):
+        # phase -> (mean, p95, max) in milliseconds over the rolling window, plus "total"
+        if not self.filled:
+            return {}
+        window = self.samples[:self.filled] * 1000
+        columns = {phase: window[:, i] for i, phase in enumerate(self.phases)}
+        columns["total"] = window.sum(axis=1)
+        return {
+            phase: (float(values.mean()), float(np.percentile(values, 95)), float(values.max()))
+            for phase, values in columns.items()
+        }
+
+    def histogram(self, phase, bins=10):
+        # Counts and bin edges (ms) of one phase over the rolling window
+        values = self.samples[:self.filled, self.index[phase]] * 1000
+        return np.histogram(values, bins=bins)
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", *(f"{phase}_ms" for phase in self.phases), "total_ms"])
+            for frame, *times in self.rows:
+                ms = [t * 1000 for t in times]
+                writer.writerow([frame, *(f"{t:.4f}" for t in ms), f"{sum(ms):.4f}"])
+        return len(self.rows)
+
+# Live table of the profiler's rolling timings, drawn in the top-right corner.
+# The text is rebuilt every `refresh_frames` frames rather than every frame,
+# so the overlay itself barely shows up in the "draw" phase it is measuring.
+class ProfilerOverlay:
+    def __init__(self, profiler, text_cache, screen_width, budget_ms=1000 / 60, refresh_frames=15):
+        self.profiler = profiler
+        self.text_cache = text_cache
+        self.screen_width = screen_width
+        self.budget_ms = budget_ms
+        self.refresh_frames = refresh_frames
+        self.surface = None
+        self.age = refresh_frames
+
+    def _render(self):
+        font = self.text_cache.font(20).font
+        summary = self.profiler.summary()
+        lines = [f"{'phase':<10}{'mean':>7}{'p95':>7}{'max':>7}"]
+        for phase in self.profiler.phases + ("total",):
+            mean, p95, peak = summary.get(phase, (0.0, 0.0, 0.0))
+            lines.append(f"{phase:<10}{mean:>7.2f}{p95:>7.2f}{peak:>7.2f}")
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 70
+        panel = pygame.Surface((width, line_height * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            y = 4 + i * line_height
+            panel.blit(font.render(line, True, (255, 255, 255)), (4, y))
+            if i:
+                # Bar: mean time as a share of the frame budget
+                mean = summary.get((self.profiler.phases + ("total",))[i - 1], (0.0,))[0]
+                bar = min(60, int(60 * mean / self.budget_ms))
+                color = (255, 80, 80) if mean > self.budget_ms else (80, 220, 80)
+                panel.fill(color, (width - 64, y + 3, max(bar, 1), line_height - 6))
+        self.surface = panel
+
+    def draw(self, surface):
+        # Returns the rect drawn
+        self.age += 1
+        if self.surface is None or self.age >= self.refresh_frames:
+            self._render()
+            self.age = 0
+        return surface.blit(self.surface, (self.screen_width - self.surface.get_width() - 10, 10))
@@ -0,0 +1,280 @@
+import numpy as np
+
+# Projectile owners
+PLAYER = 0
+ENEMY = 1
+
+# Grid cell size of the collision broadphase, and the rects x bullets count
+# below which a plain dense overlap test is cheaper than sorting into cells
+CELL_SIZE = 32
+DENSE_LIMIT = 1 << 16
+
+# Structure-of-arrays projectile engine.
+# Every live bullet sits in slots [0, count) of contiguous NumPy arrays, so
+# moving, culling and colliding all bullets is one vectorized step each (with
+# a sort-and-search broadphase for collisions, see _overlaps) and
+# drawing is a single Surface.blits call per owner.
+# The previous step's positions are kept too, for render interpolation.
+# With masks (owner -> pygame.mask.Mask), bullet/sprite pairs whose rects
+# overlap are checked pixel by pixel against the sprite's shared mask; the
+# rect test stays the vectorized broadphase, so few pairs get that far.
+# Since masks are shared per image, whether a bullet touches a sprite only
+# depends on their offset: each sprite mask gets a table of Mask.overlap
+# results for every offset at which the rects overlap, built on first use,
+# and the pixel test for all pairs becomes one lookup.
+# Dead bullets are compacted away at the end of update(); spawning appends.
+class ProjectileSystem:
+    def __init__(self, width, height, images, capacity=1024, masks=None):
+        # images: owner -> surface; the surface size is the bullet's hitbox
+        self.width = width
+        self.height = height
+        self.images = images
+        self.masks = masks or {}
+        # (sprite mask, owner) -> overlap table, see _overlap_table
+        self.overlap_tables = {}
+        self.sizes = np.zeros((max(images) + 1, 2), dtype=np.float32)
+        for owner, image in images.items():
+            self.sizes[owner] = image.get_size()
+        self.count = 0
+        self.peak = 0
+        self.grown = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.px = np.zeros(capacity, dtype=np.float32)
+        self.py = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def _grow(self):
+        old = (self.x, self.y, self.px, self.py, self.vx, self.vy, self.owner, self.alive)
+        self._allocate(self.capacity * 2)
+        for new, previous in zip((self.x, self.y, self.px, self.py, self.vx, self.vy, self.owner, self.alive), old):
+            new[:len(previous)] = previous
+        self.grown += 1
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, centerx, centery, vx, vy, owner):
+        # Positions are stored as the top-left corner, like Rect(center=...) would
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        w, h = self.sizes[owner]
+        self.x[i] = centerx - w // 2
+        self.y[i] = centery - h // 2
+        self.px[i] = self.x[i]
+        self.py[i] = self.y[i]
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.owner[i] = owner
+        self.alive[i] = True
+        self.count = i + 1
+        self.peak = max(self.peak, self.count)
+
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        self.px[:n] = x
+        self.py[:n] = y
+        x += self.vx[:n]
+        y += self.vy[:n]
+        size = self.sizes[self.owner[:n]]
+        alive = self.alive[:n]
+        # Cull bullets that have left the screen in any direction
+        alive &= (y + size[:, 1] >= 0) & (y <= self.height) & (x + size[:, 0] >= 0) & (x <= self.width)
+        self._compact()
+
+    def _compact(self):
+        n = self.count
+        keep = np.flatnonzero(self.alive[:n])
+        if len(keep) == n:
+            return
+        k = len(keep)
+        for arr in (self.x, self.y, self.px, self.py, self.vx, self.vy, self.owner):
+            arr[:k] = arr[keep]
+        self.alive[:k] = True
+        self.alive[k:n] = False
+        self.count = k
+
+    def _overlaps(self, rects, owner):
+        # Every (rect, bullet) pair that overlaps under pygame colliderect rules, as
+        # two arrays sorted by rect: rect numbers and positions in index (the live
+        # bullets of owner).
+        # Broadphase: bullets are sorted by the grid cell of their top-left corner,
+        # row by row, so the bullets that could touch a rect in one cell row are a
+        # contiguous run found with two binary searches. Only those candidates get
+        # the exact test, so the work follows the number of near pairs rather than
+        # rects x bullets. Small cases just test every pair at once.
+        n = self.count
+        index = np.flatnonzero(self.alive[:n] & (self.owner[:n] == owner))
+        if not len(index) or not len(rects):
+            return index, None, None
+        r = np.asarray(rects, dtype=np.float32).reshape(-1, 4)
+        w, h = self.sizes[owner]
+        left = np.floor(self.x[index])
+        top = np.floor(self.y[index])
+        if len(r) * len(index) <= DENSE_LIMIT:
+            hit = (
+                (left[None, :] < (r[:, 0] + r[:, 2])[:, None]) &
+                (left[None, :] + w > r[:, 0][:, None]) &
+                (top[None, :] < (r[:, 1] + r[:, 3])[:, None]) &
+                (top[None, :] + h > r[:, 1][:, None])
+            )
+            rect_of, bullet_of = np.nonzero(hit)
+            if not len(rect_of):
+                return index, None, None
+            return index, rect_of, bullet_of
+
+        size = CELL_SIZE
+        cols = self.width // size + 1
+        rows = self.height // size + 1
+        cell = (np.clip(top // size, 0, rows - 1) * cols + np.clip(left // size, 0, cols - 1)).astype(np.int64)
+        order = np.argsort(cell, kind='stable')
+        sorted_cell = cell[order]
+
+        # Cell ranges a bullet's top-left must fall in to overlap each rect
+        # (bullet left in (r.left - w, r.right), top in (r.top - h, r.bottom))
+        col0 = np.clip((r[:, 0] - w + 1) // size, 0, cols - 1).astype(np.int64)
+        col1 = np.clip((r[:, 0] + r[:, 2] - 1) // size, 0, cols - 1).astype(np.int64)
+        row0 = np.clip((r[:, 1] - h + 1) // size, 0, rows - 1).astype(np.int64)
+        row1 = np.clip((r[:, 1] + r[:, 3] - 1) // size, 0, rows - 1).astype(np.int64)
+        span = int((row1 - row0).max()) + 1
+        row = row0[:, None] + np.arange(span)[None, :]
+        lo = np.searchsorted(sorted_cell, row * cols + col0[:, None], side='left')
+        hi = np.searchsorted(sorted_cell, row * cols + col1[:, None], side='right')
+        counts = np.where(row <= row1[:, None], hi - lo, 0).ravel()
+        total = int(counts.sum())
+        if not total:
+            return index, None, None
+        rect_of = np.repeat(np.repeat(np.arange(len(r)), span), counts)
+        # Position within each run, added to the run's start
+        run_start = np.repeat(np.cumsum(counts) - counts, counts)
+        bullet_of = order[np.repeat(lo.ravel(), counts) + np.arange(total) - run_start]
+        rl = r[rect_of]
+        near = ((left[bullet_of] < rl[:, 0] + rl[:, 2]) & (left[bullet_of] + w > rl[:, 0]) &
+                (top[bullet_of] < rl[:, 1] + rl[:, 3]) & (top[bullet_of] + h > rl[:, 1]))
+        if not near.any():
+            return index, None, None
+        return index, rect_of[near], bullet_of[near]
+
+    def _overlap_table(self, mask, owner):
+        # table[dy + bh - 1, dx + bw - 1]: does owner's bullet at offset (dx, dy)
+        # from the mask's top-left touch it
+        key = (mask, owner)
+        table = self.overlap_tables.get(key)
+        if table is None:
+            bullet_mask = self.masks[owner]
+            w, h = mask.get_size()
+            bw, bh = bullet_mask.get_size()
+            table = np.array([[mask.overlap(bullet_mask, (dx, dy)) is not None for dx in range(1 - bw, w)]
+                              for dy in range(1 - bh, h)], dtype=bool)
+            self.overlap_tables[key] = table
+        return table
+
+    def _refine(self, index, rect_of, bullet_of, masks, offsets, owner):
+        # Drop the pairs whose pixels do not touch. masks[r] is rect r's mask
+        # (None keeps its rect hits) and offsets[r] that rect's top-left.
+        bullet_mask = self.masks.get(owner)
+        if bullet_mask is None:
+            return rect_of, bullet_of
+        bw, bh = bullet_mask.get_size()
+        offsets = np.asarray(offsets, dtype=np.int64).reshape(-1, 2)
+        struck = index[bullet_of]
+        dx = np.floor(self.x[struck]).astype(np.int64) - offsets[rect_of, 0] + bw - 1
+        dy = np.floor(self.y[struck]).astype(np.int64) - offsets[rect_of, 1] + bh - 1
+        # Rects that share a mask share a table
+        shared = {}
+        for r in np.unique(rect_of).tolist():
+            if masks[r] is not None:
+                shared.setdefault(masks[r], []).append(r)
+        keep = np.ones(len(rect_of), dtype=bool)
+        for mask, rects in shared.items():
+            table = self._overlap_table(mask, owner)
+            pairs = np.flatnonzero(np.isin(rect_of, rects))
+            x = dx[pairs]
+            y = dy[pairs]
+            inside = (x >= 0) & (y >= 0) & (x < table.shape[1]) & (y < table.shape[0])
+            hit = np.zeros(len(pairs), dtype=bool)
+            hit[inside] = table[y[inside], x[inside]]
+            keep[pairs] = hit
+        return rect_of[keep], bullet_of[keep]
+
+    def collide_sprites(self, sprites, owner):
+        # Same outcome as groupcollide(sprites, bullets, True, True): each bullet is
+        # used up by the first sprite (in order) it overlaps. Returns the hit sprites.
+        # Sprites with a mask attribute are hit pixel-perfectly when the owner has a mask.
+        sprites = list(sprites)
+        index, rect_of, bullet_of = self._overlaps([tuple(s.rect) for s in sprites], owner)
+        if rect_of is None:
+            return []
+        if self.masks:
+            rect_of, bullet_of = self._refine(index, rect_of, bullet_of, [getattr(s, "mask", None) for s in sprites],
+                                              [s.rect.topleft for s in sprites], owner)
+            if not len(rect_of):
+                return []
+        # Pairs come sorted by rect, so a bullet's first pair names the first sprite it overlaps
+        struck, first = np.unique(bullet_of, return_index=True)
+        self.alive[index[struck]] = False
+        self._compact()
+        return [sprites[i] for i in np.unique(rect_of[first])]
+
+    def collide_rect(self, rect, owner, mask=None):
+        # Kill every bullet of owner overlapping rect and return how many there were.
+        # mask, if given, is the mask of whatever sits at rect's top-left.
+        index, rect_of, bullet_of = self._overlaps([tuple(rect)], owner)
+        if rect_of is None:
+            return 0
+        if mask is not None:
+            rect_of, bullet_of = self._refine(index, rect_of, bullet_of, [mask], [rect.topleft], owner)
+        struck = index[bullet_of]
+        if len(struck):
+            self.alive[struck] = False
+            self._compact()
+        return len(struck)
+
+    def draw(self, surface, rects=None, alpha=1.0):
+        # When rects is a list, the on-screen part of every bullet is appended to it.
+        # alpha < 1 draws bullets part way between the previous and current step.
+        n = self.count
+        if not n:
+            return
+        if alpha < 1.0:
+            px = self.px[:n]
+            py = self.py[:n]
+            xs = (px + (self.x[:n] - px) * alpha).astype(np.int32)
+            ys = (py + (self.y[:n] - py) * alpha).astype(np.int32)
+        else:
+            xs = self.x[:n].astype(np.int32)
+            ys = self.y[:n].astype(np.int32)
+        owners = self.owner[:n]
+        for owner, image in self.images.items():
+            mine = owners == owner
+            positions = zip(xs[mine].tolist(), ys[mine].tolist())
+            surface.blits([(image, pos) for pos in positions], doreturn=False)
+        if rects is not None:
+            size = self.sizes[owners].astype(np.int32)
+            left = np.clip(xs, 0, self.width)
+            top = np.clip(ys, 0, self.height)
+            right = np.clip(xs + size[:, 0], 0, self.width)
+            bottom = np.clip(ys + size[:, 1], 0, self.height)
+            visible = (right > left) & (bottom > top)
+            rects.extend(zip(left[visible].tolist(), top[visible].tolist(),
+                             (right - left)[visible].tolist(), (bottom - top)[visible].tolist()))
+
+    def stats(self):
+        return {
+            "live": self.count,
+            "peak": self.peak,
+            "capacity": self.capacity,
+            "grown": self.grown
+        }
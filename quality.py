@@ -0,0 +1,71 @@
+import numpy as np
+
+# Adaptive quality governor.
+# The game loop reports how long each frame's work took (not the time spent
+# sleeping for the frame cap). Once a full window of frames is in, the
+# governor compares the window's 90th percentile with the frame budget:
+# above `over` times the budget it steps one level down, below `under`
+# times the budget it steps one level up. After any change it waits for a
+# fresh window, and stepping up also needs a longer run of headroom, so
+# the level does not flap between two neighbours.
+# Levels are ordered from cheapest (0) to best looking; what a level means
+# is up to the caller.
+class QualityGovernor:
+    def __init__(self, levels, budget_ms, level=None, enabled=True, window=60,
+                 over=0.9, under=0.5, up_windows=3):
+        self.levels = levels
+        self.budget_ms = budget_ms
+        self.level = len(levels) - 1 if level is None else max(0, min(level, len(levels) - 1))
+        self.enabled = enabled
+        self.over = over
+        self.under = under
+        self.up_windows = up_windows
+        self.samples = np.zeros(window, dtype=np.float64)
+        self.filled = 0
+        self.headroom = 0
+        self.steps_down = 0
+        self.steps_up = 0
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def reset(self):
+        # Forget the current window, e.g. after a pause or a level change
+        self.filled = 0
+        self.headroom = 0
+
+    def record(self, frame_ms):
+        # Returns True when the level changed
+        if not self.enabled:
+            return False
+        self.samples[self.filled] = frame_ms
+        self.filled += 1
+        if self.filled < len(self.samples):
+            return False
+        self.filled = 0
+        p90 = float(np.percentile(self.samples, 90))
+
+        if p90 > self.budget_ms * self.over:
+            self.headroom = 0
+            if self.level > 0:
+                self.level -= 1
+                self.steps_down += 1
+                return True
+        elif p90 < self.budget_ms * self.under:
+            self.headroom += 1
+            if self.headroom >= self.up_windows and self.level < len(self.levels) - 1:
+                self.headroom = 0
+                self.level += 1
+                self.steps_up += 1
+                return True
+        else:
+            self.headroom = 0
+        return False
+
+    def stats(self):
+        return {
+            "level": self.level,
+            "steps_down": self.steps_down,
+            "steps_up": self.steps_up
+        }
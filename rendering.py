@@ -0,0 +1,101 @@
+import pygame
+
+RENDER_MODES = ('flip', 'dirty')
+
+# Frame presenter with two modes:
+# - 'flip' redraws the whole background and flips the full display every frame
+# - 'dirty' only restores the background under what was drawn last frame and
+#   pushes the old and new rects with pygame.display.update(rects)
+# Drawing code appends the screen rects it touched to frame_rects() when
+# tracking is on. The renderer also measures how much of the screen each
+# frame sends to the display.
+class Renderer:
+    def __init__(self, screen, background, mode='flip'):
+        if mode not in RENDER_MODES:
+            mode = 'flip'
+        self.screen = screen
+        self.background = background
+        self.mode = mode
+        self.tracking = mode == 'dirty'
+        self.screen_rect = screen.get_rect()
+        self.screen_area = self.screen_rect.width * self.screen_rect.height
+        self.previous = []
+        self.drawn = []
+        self.full_redraw = True
+        self.frames = 0
+        self.last_area = 0
+        self.total_area = 0
+
+    def invalidate(self):
+        # Something else (a menu, an overlay) drew over the screen
+        self.full_redraw = True
+
+    def begin_frame(self):
+        if self.full_redraw or not self.tracking:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            background = self.background
+            self.screen.blits([(background, rect, rect) for rect in self.previous], doreturn=False)
+        self.drawn = []
+
+    def frame_rects(self):
+        # List to append drawn rects to, or None when nothing needs tracking
+        return self.drawn if self.tracking else None
+
+    def add_rect(self, rect):
+        if self.tracking:
+            rect = self.screen_rect.clip(rect)
+            if rect.width and rect.height:
+                self.drawn.append(rect)
+
+    def end_frame(self):
+        if self.full_redraw or not self.tracking:
+            pygame.display.flip()
+            area = self.screen_area
+            self.full_redraw = False
+        else:
+            rects = self.previous + self.drawn
+            pygame.display.update(rects)
+            # Overlapping rects are counted once per rect
+            area = sum(rect[2] * rect[3] for rect in rects)
+        self.previous = self.drawn
+        self.frames += 1
+        self.last_area = area
+        self.total_area += area
+
+    def stats(self):
+        average = self.total_area / self.frames if self.frames else 0
+        return {
+            "mode": self.mode,
+            "frames": self.frames,
+            "last_area": self.last_area,
+            "average_area": average,
+            "average_coverage": average / self.screen_area
+        }
+
+# Sprites that moved further than this in one step were placed, not moved
+# (respawned, wrapped, pulled from a pool), so they are not interpolated
+SNAP_DISTANCE = 64
+
+# Render interpolation for sprites.
+# remember_positions() runs before each simulation step; draw_interpolated()
+# blits every sprite between that position and its current one. alpha=1
+# draws exactly what the simulation has, like Group.draw.
+def remember_positions(sprites):
+    for sprite in sprites:
+        sprite.prev_pos = sprite.rect.topleft
+
+def draw_interpolated(surface, sprites, alpha=1.0):
+    # Returns the rects blitted
+    blits = []
+    for sprite in sprites:
+        x, y = sprite.rect.topleft
+        prev = getattr(sprite, 'prev_pos', None)
+        if alpha < 1.0 and prev is not None:
+            dx = x - prev[0]
+            dy = y - prev[1]
+            if abs(dx) < SNAP_DISTANCE and abs(dy) < SNAP_DISTANCE:
+                x = round(prev[0] + dx * alpha)
+                y = round(prev[1] + dy * alpha)
+        blits.append((sprite.image, (x, y)))
+    return surface.blits(blits)
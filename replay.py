@@ -0,0 +1,86 @@
+import struct
+from controls import IDLE, to_mask, from_mask
+
+# Input recordings.
+# A game is fully determined by its RNG seed and the controls polled on each
+# simulation step, so that is all a recording holds:
+#   header: magic, version, seed, simulation fps, step count, final score
+#   body:   run-length encoded control masks, (steps: uint16, mask: uint8) per run
+# The final score lets a replay check that it really reproduced the game.
+MAGIC = b"SSRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHQHIi")
+RUN = struct.Struct("<HB")
+MAX_RUN = 0xFFFF
+
+class Recording:
+    def __init__(self, seed, fps, masks=None, score=0):
+        self.seed = seed
+        self.fps = fps
+        self.masks = masks if masks is not None else bytearray()
+        self.score = score
+
+    def save(self, path):
+        runs = []
+        masks = self.masks
+        i = 0
+        while i < len(masks):
+            mask = masks[i]
+            j = i + 1
+            while j < len(masks) and masks[j] == mask and j - i < MAX_RUN:
+                j += 1
+            runs.append(RUN.pack(j - i, mask))
+            i = j
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.fps, len(masks), self.score))
+            f.write(b"".join(runs))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not an input recording")
+        magic, version, seed, fps, steps, score = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an input recording")
+        if version != VERSION:
+            raise ValueError(f"{path} is recording version {version}, expected {VERSION}")
+        masks = bytearray()
+        for run, mask in RUN.iter_unpack(data[HEADER.size:]):
+            masks.extend(bytes((mask,)) * run)
+        if len(masks) != steps:
+            raise ValueError(f"{path} is truncated: {len(masks)} of {steps} steps")
+        return cls(seed, fps, masks, score)
+
+# Wraps another input source and records every poll
+class RecordingInput:
+    def __init__(self, source):
+        self.source = source
+        self.recording = None
+
+    def start(self, seed, fps):
+        self.recording = Recording(seed, fps)
+
+    def poll(self, player, enemies):
+        controls = self.source.poll(player, enemies)
+        if self.recording is not None:
+            self.recording.masks.append(to_mask(controls))
+        return controls
+
+# Plays a recording back, one mask per poll; idle once it runs out
+class ReplayInput:
+    def __init__(self, recording):
+        self.recording = recording
+        self.step = 0
+
+    @property
+    def finished(self):
+        return self.step >= len(self.recording.masks)
+
+    def poll(self, player, enemies):
+        if self.finished:
+            return IDLE
+        mask = self.recording.masks[self.step]
+        self.step += 1
+        return from_mask(mask)
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import numpy as np
+from pygame import mixer
+
+# Procedural sound effects, built in memory.
+# Every effect is a frequency sweep with optional harmonics and a fade,
+# described by a small spec. SoundBank turns a spec (and a pitch factor)
+# into 16-bit PCM in the mixer's own format and hands it straight to
+# mixer.Sound(buffer=...), so no WAV file is read at all. The PCM is also
+# written to a cache directory under a hash of everything that shaped it,
+# so later runs skip the synthesis; pitch variants are just more specs.
+SYNTH_VERSION = 2
+
+# The sounds create_sounds.py used to write to sounds/*.wav
+SOUND_SPECS = {
+    # Simple laser: 1000 -> 500 Hz sweep with a fade out
+    "shoot": {"duration": 0.1, "start_freq": 1000, "end_freq": 500,
+              "harmonics": [0.5], "fade_in": 0.0, "fade_out": None},
+    # Lower laser for enemies
+    "enemy_shoot": {"duration": 0.15, "start_freq": 800, "end_freq": 300,
+                    "harmonics": [0.5], "fade_in": 0.0, "fade_out": None},
+    # Rising tone with harmonics, quick fade in and out
+    "powerup": {"duration": 0.3, "start_freq": 300, "end_freq": 800,
+                "harmonics": [0.3, 0.2, 0.1], "fade_in": 0.1, "fade_out": 0.2},
+}
+
+def synthesize(spec, sample_rate=44100, pitch=1.0):
+    # Float samples in [-1, 1]. Harmonic i (from 0) is at (i + 1) times the
+    # sweep frequency. fade_out None fades over the whole sound.
+    duration = spec["duration"]
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    freq = np.linspace(spec["start_freq"] * pitch, spec["end_freq"] * pitch, len(t))
+    phase = 2 * np.pi * freq * t
+    sound = np.zeros(len(t))
+    for i, amplitude in enumerate(spec["harmonics"]):
+        sound += amplitude * np.sin((i + 1) * phase)
+
+    fade_out = spec["fade_out"]
+    if fade_out is None:
+        sound *= np.linspace(1, 0, len(t))
+    else:
+        fade_in = np.linspace(0, 1, int(spec["fade_in"] * sample_rate))
+        fade_out = np.linspace(1, 0, int(fade_out * sample_rate))
+        sound *= np.concatenate([fade_in, np.ones(len(t) - len(fade_in) - len(fade_out)), fade_out])
+    return sound
+
+def to_pcm16(samples, channels=1):
+    # Interleaved signed 16-bit samples, the same value on every channel
+    pcm = np.round(np.clip(samples, -1, 1) * 32767).astype(np.int16)
+    if channels > 1:
+        pcm = np.repeat(pcm, channels)
+    return pcm
+
+class SoundBank:
+    def __init__(self, specs=SOUND_SPECS, cache_dir=".sound_cache"):
+        init = mixer.get_init()
+        if init is None:
+            raise RuntimeError("SoundBank needs an initialized mixer")
+        self.sample_rate, sample_format, self.channels = init
+        if abs(sample_format) != 16:
+            raise RuntimeError(f"SoundBank only builds 16-bit sound, mixer format is {sample_format}")
+        self.specs = specs
+        self.cache_dir = cache_dir
+        self.sounds = {}
+        self.synthesized = 0
+        self.cache_hits = 0
+
+    def _key(self, name, pitch):
+        spec = json.dumps(self.specs[name], sort_keys=True)
+        text = f"{SYNTH_VERSION}|{spec}|{pitch}|{self.sample_rate}|{self.channels}"
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def _pcm(self, name, pitch):
+        key = self._key(name, pitch)
+        path = os.path.join(self.cache_dir, f"{name}-{key[:16]}.pcm") if self.cache_dir else None
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                self.cache_hits += 1
+                return f.read()
+
+        samples = synthesize(self.specs[name], self.sample_rate, pitch)
+        data = to_pcm16(samples, self.channels).tobytes()
+        self.synthesized += 1
+        if path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(path + ".tmp", 'wb') as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+            except OSError:
+                # The cache is only an optimization
+                pass
+        return data
+
+    def get(self, name, pitch=1.0):
+        key = (name, pitch)
+        sound = self.sounds.get(key)
+        if sound is None:
+            sound = mixer.Sound(buffer=self._pcm(name, pitch))
+            self.sounds[key] = sound
+        return sound
+
+    def variants(self, name, pitches):
+        return [self.get(name, pitch) for pitch in pitches]
+
+    def stats(self):
+        return {
+            "sounds": len(self.sounds),
+            "synthesized": self.synthesized,
+            "cache_hits": self.cache_hits
+        }
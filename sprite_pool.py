@@ -0,0 +1,83 @@
+import pygame
+
+# Sprite that goes back to its pool when killed instead of being thrown away.
+# Subclasses put their per-spawn state in reset(*args) and call it from __init__.
+class PooledSprite(pygame.sprite.Sprite):
+    pool = None
+    in_use = False
+
+    def reset(self, *args):
+        pass
+
+    def kill(self):
+        super().kill()
+        if self.in_use:
+            self.in_use = False
+            if self.pool is not None:
+                self.pool.release(self)
+
+# Pool of reusable sprites of one class.
+# spawn() hands out a reset instance already added to the pool's groups.
+# When more than `capacity` sprites are live at once the pool is exhausted:
+# the spawn still succeeds with a fresh instance, but it is counted.
+class SpritePool:
+    def __init__(self, sprite_class, capacity, *groups):
+        self.sprite_class = sprite_class
+        self.capacity = capacity
+        self.groups = groups
+        self.free = []
+        self.live = 0
+        self.peak_live = 0
+        self.created = 0
+        self.reused = 0
+        self.exhausted = 0
+        self.discarded = 0
+
+    def set_groups(self, *groups):
+        # Called whenever the game rebuilds its sprite groups
+        self.groups = groups
+
+    def prefill(self, count, *args):
+        # Allocate up front so the first waves do not allocate mid-game
+        while len(self.free) < min(count, self.capacity):
+            sprite = self.sprite_class(*args)
+            sprite.pool = self
+            self.created += 1
+            self.free.append(sprite)
+
+    def spawn(self, *args):
+        if self.live >= self.capacity:
+            self.exhausted += 1
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.reused += 1
+        else:
+            sprite = self.sprite_class(*args)
+            sprite.pool = self
+            self.created += 1
+        sprite.in_use = True
+        sprite.add(*self.groups)
+        self.live += 1
+        self.peak_live = max(self.peak_live, self.live)
+        return sprite
+
+    def release(self, sprite):
+        self.live -= 1
+        if len(self.free) < self.capacity:
+            self.free.append(sprite)
+        else:
+            # Overflow instance from an exhausted pool; let it be collected
+            self.discarded += 1
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "live": self.live,
+            "free": len(self.free),
+            "peak_live": self.peak_live,
+            "created": self.created,
+            "reused": self.reused,
+            "exhausted": self.exhausted,
+            "discarded": self.discarded
+        }
@@ -0,0 +1,102 @@
+import numpy as np
+import pygame
+
+# Pixel stamps per star size, roughly matching pygame.draw.circle radius 1-3
+STAMPS = {
+    1: [(0, 0)],
+    2: [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)],
+    3: [(dx, dy) for dx in range(-1, 2) for dy in range(-1, 2)] + [(-2, 0), (2, 0), (0, -2), (0, 2)],
+}
+
+# Stars stay this far from the edges so no stamp pixel ever falls outside
+MARGIN = 2
+
+# Parallax starfield kept in NumPy arrays.
+# All stars move in one vectorized step and are written straight into the
+# target surface's pixels through pygame.surfarray, so the cost per frame
+# is a handful of array operations no matter how many stars there are.
+# Star i belongs to layer i % layers, so every layer is a strided view and
+# any star count keeps the layers balanced.
+# Pixels are scattered through a flat view of the surface, which is several
+# times cheaper than 2D fancy indexing.
+# Layer 0 is the farthest: smallest, slowest and dimmest.
+class Starfield:
+    def __init__(self, width, height, count=100, layers=3, seed=None):
+        self.width = width
+        self.height = height
+        self.layers = layers
+        self.rng = np.random.default_rng(seed)
+        self.layer_speeds = np.linspace(0.5, 2.0, layers).astype(np.float32)
+        self.layer_colors = [(int(c), int(c), int(c)) for c in np.linspace(110, 255, layers)]
+        self.layer_stamps = []
+        self.layer_radius = []
+        for l in range(layers):
+            stamp = np.array(STAMPS[min(3, 1 + l * 3 // layers)], dtype=np.intp)
+            self.layer_stamps.append((stamp[:, 0], stamp[:, 1]))
+            self.layer_radius.append(int(np.abs(stamp).max()))
+        self.count = 0
+        self.x = np.empty(0, dtype=np.float32)
+        self.y = np.empty(0, dtype=np.float32)
+        self.speed = np.empty(0, dtype=np.float32)
+        self.set_count(count)
+
+    def set_count(self, count):
+        # Grow the arrays when needed; shrinking only hides the extra stars
+        old = len(self.x)
+        if count > old:
+            extra = count - old
+            layer = np.arange(old, count) % self.layers
+            jitter = self.rng.uniform(0.85, 1.15, extra).astype(np.float32)
+            x = self.rng.uniform(MARGIN, self.width - MARGIN - 1, extra).astype(np.float32)
+            y = self.rng.uniform(MARGIN, self.height - MARGIN - 1, extra).astype(np.float32)
+            self.x = np.concatenate([self.x, x])
+            self.y = np.concatenate([self.y, y])
+            self.speed = np.concatenate([self.speed, self.layer_speeds[layer] * jitter])
+        self.count = count
+
+    def reseed(self, seed):
+        # Restart the random stream used for wrapped stars, for reproducible runs
+        self.rng = np.random.default_rng(seed)
+
+    def update(self):
+        n = self.count
+        y = self.y[:n]
+        y += self.speed[:n]
+        wrapped = np.flatnonzero(y >= self.height - MARGIN - 1)
+        if wrapped.size:
+            y[wrapped] = MARGIN
+            self.x[wrapped] = self.rng.uniform(MARGIN, self.width - MARGIN - 1, wrapped.size)
+
+    def draw(self, surface, rects=None, alpha=1.0):
+        # When rects is a list, the bounding rect of every drawn star is appended to it.
+        # alpha < 1 draws stars part way between the previous and current step.
+        n = self.count
+        xi = self.x[:n].astype(np.intp)
+        if alpha < 1.0:
+            # Just-wrapped stars stay on the margin rather than drawing off screen
+            yi = np.maximum(self.y[:n] - self.speed[:n] * (1.0 - alpha), MARGIN).astype(np.intp)
+        else:
+            yi = self.y[:n].astype(np.intp)
+        width = surface.get_width()
+
+        pixels = pygame.surfarray.pixels2d(surface)
+        try:
+            # surfarray is indexed [x, y]; its transpose is row-major unless rows are padded
+            rows = pixels.T
+            flat = rows.reshape(-1) if rows.flags['C_CONTIGUOUS'] else None
+            # Far layers first so near stars end up on top
+            for l in range(self.layers):
+                dx, dy = self.layer_stamps[l]
+                lx = xi[l::self.layers, None]
+                ly = yi[l::self.layers, None]
+                color = surface.map_rgb(self.layer_colors[l])
+                if flat is not None:
+                    flat[(ly * width + lx + (dy * width + dx)).ravel()] = color
+                else:
+                    pixels[(lx + dx).ravel(), (ly + dy).ravel()] = color
+                if rects is not None:
+                    r = self.layer_radius[l]
+                    rects.extend((x - r, y - r, 2 * r + 1, 2 * r + 1) for x, y in zip(lx.ravel().tolist(), ly.ravel().tolist()))
+        finally:
+            # Release the surface lock before anything else blits to it
+            del pixels
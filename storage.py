@@ -0,0 +1,332 @@
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+
+# Storage backends for GameData.
+# Every change to the stats is an event (a small dict, see apply_event).
+# A backend persists the aggregate document (totals, power-up counts,
+# settings) and the per-session score history:
+#   load()                          -> the aggregate document, or None if nothing is stored
+#   apply(data, event)              -> apply an event; True if data now needs a save()
+#   save(data, keys=None)           -> persist the aggregate document; keys, if given, are the
+#                                      only ones changed since the last save
+#   top_scores(data, limit, ...)    -> best sessions first, optionally for one day/difficulty
+#   close()
+
+# Event kinds:
+#   {"ev": "kill", "kills": n, "play_time": seconds, "at": date}
+#   {"ev": "powerup", "type": "SHIELD", "at": date}
+#   {"ev": "session_end", "session": {"score", "level", "kills", "play_time", "powerups", "difficulty", "date"}}
+#   {"ev": "settings", "settings": {...}}
+def apply_event(data, event, keep_scores=10):
+    kind = event["ev"]
+    if kind == "kill":
+        data["total_kills"] = data.get("total_kills", 0) + event["kills"]
+        data["total_play_time"] = data.get("total_play_time", 0) + event["play_time"]
+        data["last_played"] = event["at"]
+    elif kind == "powerup":
+        powerups = data.setdefault("powerups_collected", {})
+        powerups[event["type"]] = powerups.get(event["type"], 0) + 1
+        data["last_played"] = event["at"]
+    elif kind == "session_end":
+        session = event["session"]
+        scores = data.setdefault("high_scores", [])
+        scores.append({
+            "score": session["score"],
+            "level": session["level"],
+            "date": session["date"]
+        })
+        # Keep only the top scores
+        data["high_scores"] = sorted(scores, key=lambda x: x["score"], reverse=True)[:keep_scores]
+    elif kind == "settings":
+        data.setdefault("settings", {}).update(event["settings"])
+
+# The aggregate keys each event kind changes
+EVENT_KEYS = {
+    "kill": ("total_kills", "total_play_time", "last_played"),
+    "powerup": ("powerups_collected", "last_played"),
+    "session_end": ("high_scores",),
+    "settings": ("settings",)
+}
+
+# The process umask, read once at import while nothing else runs (reading it means setting it)
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+# Whole state in one JSON document (the original game_data.json format).
+# Only the top `keep_scores` sessions are kept, inside the document itself.
+class JsonStorage:
+    def __init__(self, path="game_data.json", keep_scores=10):
+        self.path = path
+        self.keep_scores = keep_scores
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, data, keys=None):
+        # Write to a temp file next to the target, then rename over it,
+        # so a crash mid-write never leaves a truncated file.
+        # mkstemp creates the file as 0600, so it gets the target's permissions
+        # (or those a plain open() would have given a new file) before the rename.
+        payload = json.dumps(data, indent=4)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            mode = stat.S_IMODE(os.stat(self.path).st_mode)
+        except OSError:
+            mode = 0o666 & ~UMASK
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".game_data.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def apply(self, data, event):
+        # Every change rewrites the whole document
+        apply_event(data, event, self.keep_scores)
+        return True
+
+    def top_scores(self, data, limit=10, day=None, difficulty=None):
+        # The document has no per-session difficulty, so that filter cannot narrow it
+        scores = data["high_scores"]
+        if day is not None:
+            scores = [s for s in scores if s["date"].startswith(day)]
+        return scores[:limit]
+
+    def close(self):
+        pass
+
+# game_data.json as a snapshot plus an append-only JSONL journal of events.
+# Appending an event is O(1); load() replays the journal tail on top of the
+# snapshot. Once the journal holds `compact_after` events, apply() asks for a
+# save(), which writes a new snapshot and drops the events it now contains.
+# Each event carries a sequence number and the snapshot records the last one
+# it includes, so events appended while a snapshot is being written survive
+# compaction, and a crash between the two steps never applies an event twice.
+class JournalStorage(JsonStorage):
+    def __init__(self, path="game_data.json", journal_path=None, keep_scores=10, compact_after=500):
+        super().__init__(path, keep_scores)
+        self.journal_path = journal_path or os.path.splitext(path)[0] + ".journal.jsonl"
+        self.compact_after = compact_after
+        self.journal_lock = threading.Lock()
+        self.journal = None
+        self.seq = 0
+        self.pending = 0
+
+    def load(self):
+        data = super().load()
+        snapshot_seq = data.get("journal_seq", 0) if data else 0
+        self.seq = snapshot_seq
+        self.pending = 0
+        for event in self._read_journal():
+            if event["seq"] <= snapshot_seq:
+                continue
+            if data is None:
+                data = {}
+            apply_event(data, event, self.keep_scores)
+            self.seq = event["seq"]
+            self.pending += 1
+        if data is not None:
+            data["journal_seq"] = self.seq
+        return data
+
+    def _read_journal(self):
+        if not os.path.exists(self.journal_path):
+            return []
+        events = []
+        with open(self.journal_path, 'r') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    # A torn last line from a crash mid-append
+                    break
+        return events
+
+    def apply(self, data, event):
+        apply_event(data, event, self.keep_scores)
+        with self.journal_lock:
+            self.seq += 1
+            data["journal_seq"] = self.seq
+            if self.journal is None:
+                self.journal = open(self.journal_path, 'a')
+            self.journal.write(json.dumps(dict(event, seq=self.seq), separators=(',', ':')) + "\n")
+            self.journal.flush()
+            self.pending += 1
+            return self.pending >= self.compact_after
+
+    def save(self, data, keys=None):
+        # Compaction: new snapshot first, then keep only events newer than it
+        super().save(data)
+        snapshot_seq = data.get("journal_seq", 0)
+        with self.journal_lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            tail = [event for event in self._read_journal() if event["seq"] > snapshot_seq]
+            if tail:
+                with open(self.journal_path + ".tmp", 'w') as f:
+                    for event in tail:
+                        f.write(json.dumps(event, separators=(',', ':')) + "\n")
+                os.replace(self.journal_path + ".tmp", self.journal_path)
+            elif os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.pending = len(tail)
+
+    def close(self):
+        with self.journal_lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+
+# Keeps everything in memory only; used by headless simulations so bot games
+# never touch the player's saved stats
+class MemoryStorage(JsonStorage):
+    def __init__(self, keep_scores=10):
+        super().__init__(None, keep_scores)
+
+    def load(self):
+        return None
+
+    def save(self, data, keys=None):
+        pass
+
+    def apply(self, data, event):
+        apply_event(data, event, self.keep_scores)
+        return False
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    kills INTEGER NOT NULL DEFAULT 0,
+    play_time REAL NOT NULL DEFAULT 0,
+    powerups TEXT NOT NULL DEFAULT '{}',
+    difficulty TEXT NOT NULL DEFAULT 'normal',
+    day TEXT NOT NULL,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_score ON sessions (score DESC);
+CREATE INDEX IF NOT EXISTS sessions_by_day ON sessions (day, score DESC);
+CREATE INDEX IF NOT EXISTS sessions_by_difficulty ON sessions (difficulty, score DESC);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Every session in an indexed SQLite table, aggregates in a small key/value table.
+# Top-N, per-day and per-difficulty queries walk an index and stop after `limit`
+# rows, and totals are kept as running values, so nothing scales with history size.
+# save() only rewrites the state rows for the keys GameData says changed since
+# the last save, so a flush after a kill is a few small UPSERTs rather than the
+# whole document.
+# An existing game_data.json is imported the first time the database is created.
+class SqliteStorage:
+    def __init__(self, path="game_data.db", legacy_json="game_data.json"):
+        self.path = path
+        # The write-behind thread saves through the same connection
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+        if legacy_json and self.load() is None:
+            self.migrate_json(legacy_json)
+
+    def load(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT key, value FROM state").fetchall()
+        if not rows:
+            return None
+        return {row["key"]: json.loads(row["value"]) for row in rows}
+
+    def save(self, data, keys=None):
+        if keys is None:
+            keys = [key for key in data if key not in ("high_scores", "journal_seq")]
+        items = [(key, json.dumps(data[key])) for key in keys if key in data]
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", items)
+
+    def apply(self, data, event):
+        # Sessions go straight into their table; aggregates wait for the next save
+        if event["ev"] == "session_end":
+            with self.lock, self.conn:
+                self._insert_session(event["session"])
+            return False
+        apply_event(data, event)
+        return True
+
+    def _insert_session(self, session):
+        self.conn.execute(
+            "INSERT INTO sessions (score, level, kills, play_time, powerups, difficulty, day, date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                session["score"],
+                session["level"],
+                session.get("kills", 0),
+                session.get("play_time", 0),
+                json.dumps(session.get("powerups") or {}),
+                session.get("difficulty", "normal"),
+                session["date"][:10],
+                session["date"]
+            )
+        )
+
+    def top_scores(self, data, limit=10, day=None, difficulty=None):
+        query = "SELECT score, level, kills, play_time, powerups, difficulty, date FROM sessions"
+        conditions = []
+        params = []
+        if day is not None:
+            conditions.append("day = ?")
+            params.append(day)
+        if difficulty is not None:
+            conditions.append("difficulty = ?")
+            params.append(difficulty)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY score DESC, id LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        scores = []
+        for row in rows:
+            score = dict(row)
+            score["powerups"] = json.loads(score["powerups"])
+            scores.append(score)
+        return scores
+
+    def session_count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def migrate_json(self, legacy_json):
+        data = JournalStorage(legacy_json).load()
+        if data is None:
+            return False
+        difficulty = data.get("settings", {}).get("difficulty", "normal")
+        with self.lock, self.conn:
+            for entry in data.get("high_scores", []):
+                self._insert_session(dict(entry, difficulty=difficulty))
+        self.save(data)
+        return True
+
+    def close(self):
+        with self.lock:
+            self.conn.close()